@@ -0,0 +1,254 @@
+import csv
+import json
+import sys
+from collections import Counter
+from time import perf_counter
+
+import degrees
+from search import ENGINES, SearchTree
+from stats import SearchReport, SearchStats
+from util import LRUCache
+
+# Marks a cache miss, since None is a cached "not connected" answer
+MISSING = object()
+
+
+def main():
+    if len(sys.argv) not in [2, 3]:
+        sys.exit("Usage: python batch.py directory [queries.jsonl]")
+
+    # Load data from files into memory once for every query
+    print("Loading data...", file=sys.stderr)
+    degrees.load_data(sys.argv[1])
+    print("Data loaded.", file=sys.stderr)
+
+    server = QueryServer(degrees.graph)
+    if len(sys.argv) == 3:
+        with open(sys.argv[2], encoding="utf-8") as f:
+            server.serve(f, sys.stdout)
+    else:
+        server.serve(sys.stdin, sys.stdout)
+
+    for line in server.report.format():
+        print(line, file=sys.stderr)
+
+
+class QueryServer():
+    """
+    Answers many separation queries against one loaded graph.
+
+    Recent answers are kept in an LRU cache of paths. People who show up
+    in at least `tree_threshold` queries get a full BFS tree, kept in a
+    smaller LRU cache, so later queries touching them are a tree walk.
+    Statistics for every query are aggregated in `report`, and included
+    in each answer if `include_stats` is set.
+    """
+
+    def __init__(self, graph, engine="bidirectional", path_cache_size=4096,
+                 tree_cache_size=8, tree_threshold=3, include_stats=False):
+        self.graph = graph
+        self.engine = engine
+        self.search = ENGINES[engine]
+        self.report = SearchReport()
+        self.include_stats = include_stats
+        self.paths = LRUCache(path_cache_size)
+        self.trees = LRUCache(tree_cache_size)
+        self.tree_threshold = tree_threshold
+        self.popularity = Counter()
+
+    def serve(self, lines, output):
+        """
+        Answers one query per input line, writing one JSON object per line.
+
+        Lines are JSON objects with "source" and "target" keys, JSON
+        [source, target] lists, or tab-separated pairs. Each endpoint may
+        be an IMDB person id or a name. A line {"ingest": directory}
+        applies the delta CSV files in that directory instead.
+        """
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                query = parse_query(line)
+            except ValueError as e:
+                answer = {"query": line, "error": str(e)}
+            else:
+                if "ingest" in query:
+                    answer = self.ingest(query["ingest"])
+                else:
+                    answer = self.answer(query["source"], query["target"])
+            output.write(json.dumps(answer) + "\n")
+            output.flush()
+
+    def answer(self, source, target):
+        """
+        Returns a JSON-serializable answer for one query. Unexpected
+        errors are reported in the answer too, so one bad query cannot
+        stop the server.
+        """
+        try:
+            return self.find_answer(source, target)
+        except Exception as e:
+            return {
+                "source": source,
+                "target": target,
+                "error": f"{type(e).__name__}: {e}",
+            }
+
+    def find_answer(self, source, target):
+        """
+        Returns the answer for one query, with an "error" key if an
+        endpoint cannot be resolved.
+        """
+        answer = {"source": source, "target": target}
+        try:
+            source_person = self.resolve(source)
+            target_person = self.resolve(target)
+        except LookupError as e:
+            answer["error"] = str(e)
+            return answer
+
+        stats = SearchStats(self.engine)
+        path = self.query(source_person, target_person, stats)
+        if self.include_stats:
+            answer["stats"] = stats.as_dict()
+        if path is None:
+            answer["degrees"] = None
+            answer["path"] = None
+            answer["component_sizes"] = [
+                self.graph.component_size(source_person),
+                self.graph.component_size(target_person),
+            ]
+        else:
+            answer["degrees"] = len(path)
+            answer["path"] = [
+                {
+                    "movie_id": self.graph.movie_ids[movie],
+                    "person_id": self.graph.person_ids[person],
+                }
+                for movie, person in path
+            ]
+        return answer
+
+    def ingest(self, directory):
+        """
+        Applies delta CSV files to the graph and drops only the cached
+        paths and trees whose component gained credits.
+        """
+        # Remember which component every cached entry belonged to
+        labels = {
+            key: self.graph.components[key[0]] for key in self.paths.items
+        }
+        roots = {
+            root: self.graph.components[root] for root in self.trees.items
+        }
+
+        try:
+            delta = self.graph.apply_delta(directory)
+        except (OSError, ValueError, csv.Error) as e:
+            return {"ingest": directory, "error": str(e)}
+
+        for key, label in labels.items():
+            if label in delta.components:
+                self.paths.discard(key)
+        for root, label in roots.items():
+            if label in delta.components:
+                self.trees.discard(root)
+        return {
+            "ingest": directory,
+            "people": len(delta.people),
+            "movies": len(delta.movies),
+            "stars": delta.stars,
+        }
+
+    def resolve(self, value):
+        """
+        Returns the person index for an IMDB id or an unambiguous name.
+        """
+        person = self.graph.person_index.get(value)
+        if person is not None:
+            return person
+        people = self.graph.names.exact(value)
+        if len(people) == 0:
+            suggestions = ", ".join(
+                self.graph.person_names[person]
+                for person in self.graph.names.search(value, 5)
+            )
+            raise LookupError(
+                f"person not found: {value} (did you mean: {suggestions})"
+                if suggestions else f"person not found: {value}"
+            )
+        if len(people) > 1:
+            ids = ", ".join(self.graph.person_ids[person] for person in people)
+            raise LookupError(f"ambiguous name {value}: {ids}")
+        return people[0]
+
+    def query(self, source, target, stats=None):
+        """
+        Returns the (movie, person) index path between two people,
+        using the caches where possible. Counters and timings go into
+        `stats`, which is then added to the report.
+        """
+        if stats is None:
+            stats = SearchStats(self.engine)
+        started = perf_counter()
+
+        key = (source, target)
+        path = self.paths.get(key, MISSING)
+        if path is not MISSING:
+            stats.cached = True
+        else:
+            self.popularity[source] += 1
+            self.popularity[target] += 1
+            if not self.graph.connected(source, target):
+                path = None
+            else:
+                with stats.timing("tree"):
+                    tree = self.tree_for(source) or self.tree_for(target)
+                with stats.timing("search"):
+                    if tree is not None:
+                        path = tree.path(source, target)
+                    else:
+                        path = self.search(self.graph, source, target, stats)
+            self.paths.put(key, path)
+
+        stats.path_length = None if path is None else len(path)
+        stats.wall_time = perf_counter() - started
+        self.report.add(stats)
+        return path
+
+    def tree_for(self, person):
+        """
+        Returns the BFS tree rooted at `person` if they are popular enough.
+        """
+        tree = self.trees.get(person)
+        if tree is None and self.popularity[person] >= self.tree_threshold:
+            tree = SearchTree(self.graph, person)
+            self.trees.put(person, tree)
+        return tree
+
+
+def parse_query(line):
+    """
+    Returns the query described by one input line, as a dict with
+    "source" and "target" keys or an "ingest" key.
+    """
+    if line[0] in "{[":
+        try:
+            query = json.loads(line)
+        except json.JSONDecodeError:
+            raise ValueError("invalid JSON")
+        if isinstance(query, dict):
+            if isinstance(query.get("ingest"), str):
+                return {"ingest": query["ingest"]}
+            query = [query.get("source"), query.get("target")]
+    else:
+        query = line.split("\t")
+    if len(query) != 2 or not all(isinstance(value, str) for value in query):
+        raise ValueError("expected a source and a target")
+    return {"source": query[0], "target": query[1]}
+
+
+if __name__ == "__main__":
+    main()
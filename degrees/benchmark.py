@@ -0,0 +1,168 @@
+import multiprocessing
+import os
+import random
+import resource
+import sys
+import time
+
+import degrees
+import snapshot
+from search import ENGINES
+from stats import SearchReport, SearchStats
+
+# Syllables for generating pronounceable first and last names
+SYLLABLES = [
+    "al", "an", "ar", "be", "bo", "ca", "da", "de", "el", "en", "fa", "ga",
+    "ha", "is", "ja", "ka", "la", "le", "li", "lo", "ma", "me", "mi", "na",
+    "ne", "no", "ra", "re", "ri", "ro", "sa", "se", "ta", "te", "to", "va",
+]
+
+# Shape of the cast size distribution (smaller means heavier tail)
+CAST_SHAPE = 1.6
+MAX_CAST = 250
+
+# Chance that a cast slot goes to someone picked by past appearances,
+# which gives people's movie counts a power-law tail
+PREFERENTIAL = 0.8
+
+# Number of queries timed per engine when none is given
+QUERIES = 200
+
+
+def main():
+    if len(sys.argv) >= 5 and sys.argv[1] == "generate":
+        seed = int(sys.argv[5]) if len(sys.argv) == 6 else 0
+        generate(sys.argv[2], int(sys.argv[3]), int(sys.argv[4]), seed)
+    elif len(sys.argv) in [3, 4, 5] and sys.argv[1] == "run":
+        queries = int(sys.argv[3]) if len(sys.argv) >= 4 else QUERIES
+        engines = sys.argv[4].split(",") if len(sys.argv) == 5 else ENGINES
+        for line in run(sys.argv[2], queries, engines):
+            print(line)
+    else:
+        sys.exit(
+            "Usage: python benchmark.py generate directory people movies [seed]\n"
+            "       python benchmark.py run directory [queries] [engine,...]"
+        )
+
+
+def generate(directory, people, movies, seed=0):
+    """
+    Write a synthetic dataset of `people` people and `movies` movies in the
+    CSV format of `degrees.load_data`. The same arguments always produce
+    the same files.
+    """
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+
+    with open(os.path.join(directory, "people.csv"), "w",
+              encoding="utf-8") as f:
+        f.write("id,name,birth\n")
+        for person in range(people):
+            name = random_name(rng)
+            birth = rng.randint(1900, 2005)
+            f.write(f'{person + 1},"{name}",{birth}\n')
+
+    with open(os.path.join(directory, "movies.csv"), "w",
+              encoding="utf-8") as f:
+        f.write("id,title,year\n")
+        for movie in range(movies):
+            title = f"{random_name(rng)} {movie + 1}"
+            year = rng.randint(1920, 2020)
+            f.write(f'{movie + 1},"{title}",{year}\n')
+
+    # Everyone listed once, so popular people are picked in proportion
+    # to their number of appearances so far
+    appearances = []
+    with open(os.path.join(directory, "stars.csv"), "w",
+              encoding="utf-8") as f:
+        f.write("person_id,movie_id\n")
+        for movie in range(movies):
+            size = min(MAX_CAST, int(rng.paretovariate(CAST_SHAPE)) + 1)
+            cast = set()
+            while len(cast) < min(size, people):
+                if appearances and rng.random() < PREFERENTIAL:
+                    cast.add(rng.choice(appearances))
+                else:
+                    cast.add(rng.randrange(people))
+            for person in cast:
+                appearances.append(person)
+                f.write(f"{person + 1},{movie + 1}\n")
+
+
+def random_name(rng):
+    """
+    Returns a random two-part name built from syllables.
+    """
+    first = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 3)))
+    last = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+    return f"{first.capitalize()} {last.capitalize()}"
+
+
+def run(directory, queries=QUERIES, engines=ENGINES):
+    """
+    Measure load time and peak memory for CSV and snapshot loading,
+    then query latency for each engine. Returns report lines.
+    """
+    lines = []
+
+    # Each load runs in a fresh process so its peak memory is its own
+    path = snapshot.path_for(directory)
+    if os.path.exists(path):
+        os.remove(path)
+    for label in ["csv", "snapshot"]:
+        seconds, peak = measure_load(directory)
+        lines.append(f"Load ({label}): {seconds:.2f} s, "
+                     f"peak memory {peak / 1024:.0f} MB")
+
+    degrees.load_data(directory)
+    graph = degrees.graph
+    lines.append(f"Graph: {len(graph.person_ids)} people, "
+                 f"{len(graph.movie_ids)} movies, "
+                 f"{len(graph.person_movies)} credits")
+
+    # Sample pairs from the largest component so most queries have a path
+    rng = random.Random(0)
+    largest = max(range(len(graph.component_sizes)),
+                  key=lambda label: graph.component_sizes[label])
+    members = [person for person in range(len(graph.person_ids))
+               if graph.components[person] == largest]
+    pairs = [(rng.choice(members), rng.choice(members))
+             for _ in range(queries)]
+
+    for engine in engines:
+        report = SearchReport()
+        search = ENGINES[engine]
+        for source, target in pairs:
+            stats = SearchStats(engine)
+            started = time.perf_counter()
+            with stats.timing("search"):
+                path = search(graph, source, target, stats)
+            stats.wall_time = time.perf_counter() - started
+            stats.path_length = None if path is None else len(path)
+            report.add(stats)
+        lines.append(f"Engine {engine}:")
+        lines.extend(f"  {line}" for line in report.format())
+    return lines
+
+
+def measure_load(directory):
+    """
+    Load a dataset in a child process.
+    Returns (seconds, peak resident memory in KB).
+    """
+    with multiprocessing.Pool(1) as pool:
+        return pool.apply(timed_load, (directory,))
+
+
+def timed_load(directory):
+    """
+    Loads a dataset and reports how long it took and the peak memory.
+    """
+    start = time.perf_counter()
+    degrees.load_data(directory)
+    seconds = time.perf_counter() - start
+    return seconds, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+if __name__ == "__main__":
+    main()
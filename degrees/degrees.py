@@ -1,55 +1,40 @@
-import csv
 import sys
+from time import perf_counter
 
-from util import Node, QueueFrontier
+import snapshot
+from graph import Graph
+from search import ENGINES, ShortestPaths
+from stats import SearchStats
 
-# Maps names to a set of corresponding person_ids
-names = {}
+# Person/movie collaboration graph, keyed internally by dense integer ids
+graph = Graph()
 
-# Maps person_ids to a dictionary of: name, birth, movies (a set of movie_ids)
-people = {}
-
-# Maps movie_ids to a dictionary of: title, year, stars (a set of person_ids)
-movies = {}
+# Functions called with the SearchStats of every shortest_path query
+stats_hooks = []
 
 
 def load_data(directory):
     """
     Load data from CSV files into memory.
+
+    Uses the binary snapshot next to the CSV files when it is up to date,
+    otherwise parses the CSV files and tries to write a fresh snapshot.
+    """
+    if snapshot.load(graph, directory):
+        return
+    graph.load(directory)
+    try:
+        snapshot.write(graph, directory)
+    except OSError:
+        pass
+
+
+def load_delta(directory):
+    """
+    Add new rows from delta CSV files in `directory` to the loaded data.
+    Returns a graph.Delta describing what changed.
     """
-    # Load people
-    with open(f"{directory}/people.csv", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            people[row["id"]] = {
-                "name": row["name"],
-                "birth": row["birth"],
-                "movies": set()
-            }
-            if row["name"].lower() not in names:
-                names[row["name"].lower()] = {row["id"]}
-            else:
-                names[row["name"].lower()].add(row["id"])
-
-    # Load movies
-    with open(f"{directory}/movies.csv", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            movies[row["id"]] = {
-                "title": row["title"],
-                "year": row["year"],
-                "stars": set()
-            }
-
-    # Load stars
-    with open(f"{directory}/stars.csv", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            try:
-                people[row["person_id"]]["movies"].add(row["movie_id"])
-                movies[row["movie_id"]]["stars"].add(row["person_id"])
-            except KeyError:
-                pass
+    return graph.apply_delta(directory)
 
 
 def main():
@@ -78,83 +63,123 @@ def main():
         print(f"{degrees} degrees of separation.")
         path = [(None, source)] + path
         for i in range(degrees):
-            person1 = people[path[i][1]]["name"]
-            person2 = people[path[i + 1][1]]["name"]
-            movie = movies[path[i + 1][0]]["title"]
+            person1 = graph.person_names[graph.person_index[path[i][1]]]
+            person2 = graph.person_names[graph.person_index[path[i + 1][1]]]
+            movie = graph.movie_titles[graph.movie_index[path[i + 1][0]]]
             print(f"{i + 1}: {person1} and {person2} starred in {movie}")
 
 
-def shortest_path(source, target):
-    
-    """Finds a solution to maze, if one exists."""
+def shortest_path(source, target, engine="bidirectional", stats=None):
+    """
+    Returns the shortest list of (movie_id, person_id) pairs
+    that connect the source to the target.
+
+    `engine` names a search strategy in `search.ENGINES`, or is a search
+    function taking (graph, source, target, stats) such as
+    `LandmarkOracle.search`. If `stats` is given, it is a SearchStats that
+    receives the search counters and per-phase timings; every function in
+    `stats_hooks` is also called with the stats of each query.
+    If no possible path, returns None.
+    """
+    if stats is None:
+        stats = SearchStats()
+    if isinstance(engine, str):
+        stats.engine = engine
+    else:
+        stats.engine = engine.__qualname__
+    started = perf_counter()
 
-    # Keep track of number of states explored
-    num_explored = 0
+    with stats.timing("resolve"):
+        source = graph.person_index[source]
+        target = graph.person_index[target]
 
-    # Initialize frontier to just the starting position
-    start = Node(state=source, parent=None, action=None)
-    frontier = QueueFrontier()
-    frontier.add(start)
+    # People in different components can never be connected
+    with stats.timing("components"):
+        connected = graph.connected(source, target)
 
-    # Initialize an empty explored set
-    explored = set()
+    path = None
+    if connected:
+        search = ENGINES[engine] if isinstance(engine, str) else engine
+        with stats.timing("search"):
+            path = search(graph, source, target, stats)
 
-    # Keep looping until solution found
-    while True:
+    result = None
+    if path is not None:
+        stats.path_length = len(path)
+        with stats.timing("translate"):
+            result = [(graph.movie_ids[movie], graph.person_ids[person])
+                      for movie, person in path]
 
-        # If nothing left in frontier, then no path
-        if frontier.empty():
-            return None
+    stats.wall_time = perf_counter() - started
+    for hook in stats_hooks:
+        hook(stats)
+    return result
 
-        # Choose a node from the frontier
-        node = frontier.remove()
-        num_explored += 1
 
-        # If node is the goal, then we have a solution
-        if node.state == target:
-            path = []
-            while node.parent is not None:
-                path.append((node.action, node.state))
-                node = node.parent
-            path.reverse()
-            return path
+def count_shortest_paths(source, target):
+    """
+    Returns how many distinct shortest paths connect two people.
+    """
+    return shortest_paths(source, target).count()
 
-        # Mark node as explored
-        explored.add(node.state)
 
-        # Add neighbors to frontier
-        for action, state in neighbors_for_person(node.state):
-            if not frontier.contains_state(state) and state not in explored:
-                child = Node(state=state, parent=node, action=action)
-                frontier.add(child)
+def all_shortest_paths(source, target, limit=None):
+    """
+    Yields every shortest list of (movie_id, person_id) pairs
+    that connects the source to the target, up to `limit` of them.
+    """
+    for path in shortest_paths(source, target).paths(limit):
+        yield [(graph.movie_ids[movie], graph.person_ids[person])
+               for movie, person in path]
 
 
+def shortest_paths(source, target):
+    """
+    Returns the search.ShortestPaths DAG between two IMDB person ids.
+    """
+    return ShortestPaths(
+        graph, graph.person_index[source], graph.person_index[target]
+    )
 
 
 def person_id_for_name(name):
     """
     Returns the IMDB id for a person's name,
-    resolving ambiguities as needed.
+    resolving ambiguities and misspellings as needed.
     """
-    person_ids = list(names.get(name.lower(), set()))
-    if len(person_ids) == 0:
-        return None
+    person_ids = [graph.person_ids[person]
+                  for person in graph.names.exact(name)]
+    if len(person_ids) == 1:
+        return person_ids[0]
     elif len(person_ids) > 1:
         print(f"Which '{name}'?")
-        for person_id in person_ids:
-            person = people[person_id]
-            name = person["name"]
-            birth = person["birth"]
-            print(f"ID: {person_id}, Name: {name}, Birth: {birth}")
-        try:
-            person_id = input("Intended Person ID: ")
-            if person_id in person_ids:
-                return person_id
-        except ValueError:
-            pass
-        return None
     else:
-        return person_ids[0]
+        person_ids = candidate_ids_for_name(name)
+        if len(person_ids) == 0:
+            return None
+        print(f"No exact match for '{name}'. Did you mean:")
+
+    for person_id in person_ids:
+        person = graph.person_index[person_id]
+        name = graph.person_names[person]
+        birth = graph.person_births[person]
+        print(f"ID: {person_id}, Name: {name}, Birth: {birth}")
+    try:
+        person_id = input("Intended Person ID: ")
+        if person_id in person_ids:
+            return person_id
+    except ValueError:
+        pass
+    return None
+
+
+def candidate_ids_for_name(name, limit=10):
+    """
+    Returns up to `limit` IMDB ids for a partial or misspelled name,
+    best match first.
+    """
+    return [graph.person_ids[person]
+            for person in graph.names.search(name, limit)]
 
 
 def neighbors_for_person(person_id):
@@ -162,11 +187,9 @@ def neighbors_for_person(person_id):
     Returns (movie_id, person_id) pairs for people
     who starred with a given person.
     """
-    movie_ids = people[person_id]["movies"]
     neighbors = set()
-    for movie_id in movie_ids:
-        for person_id in movies[movie_id]["stars"]:
-            neighbors.add((movie_id, person_id))
+    for movie, person in graph.neighbors(graph.person_index[person_id]):
+        neighbors.add((graph.movie_ids[movie], graph.person_ids[person]))
     return neighbors
 
 
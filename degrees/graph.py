@@ -0,0 +1,437 @@
+import csv
+import os
+import sys
+from array import array
+
+from nameindex import NameIndex
+from util import INDEX, writable
+
+# Columns every row of each dataset file must have
+COLUMNS = {
+    "people.csv": ["id", "name", "birth"],
+    "movies.csv": ["id", "title", "year"],
+    "stars.csv": ["person_id", "movie_id"],
+}
+
+
+class Graph():
+    """
+    Person/movie collaboration graph stored as compact CSR arrays.
+
+    People and movies are numbered densely from 0 in the order they
+    appear in their CSV files. The movies of person `p` are
+    `person_movies[person_offsets[p]:person_offsets[p + 1]]` and the
+    stars of movie `m` are `movie_people[movie_offsets[m]:movie_offsets[m + 1]]`.
+    IMDB id strings are only used when translating in and out of the graph.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        """
+        Reset the graph to an empty state.
+        """
+        # Per-person attributes, indexed by dense person index
+        self.person_ids = []
+        self.person_names = []
+        self.person_births = []
+        self.person_index = {}
+
+        # Per-movie attributes, indexed by dense movie index
+        self.movie_ids = []
+        self.movie_titles = []
+        self.movie_years = []
+        self.movie_index = {}
+
+        # Adjacency in both directions
+        self.person_offsets = array(INDEX, [0])
+        self.person_movies = array(INDEX)
+        self.movie_offsets = array(INDEX, [0])
+        self.movie_people = array(INDEX)
+
+        # Connected component label of each person, and size of each component
+        self.components = array(INDEX)
+        self.component_sizes = array(INDEX)
+
+        # Exact, prefix and fuzzy lookup of people by name
+        self.names = NameIndex.build(self.person_names)
+
+    def load(self, directory):
+        """
+        Load data from CSV files in `directory` into the graph.
+        """
+        self.clear()
+
+        # Load people, keeping the first row of a repeated id
+        with open(f"{directory}/people.csv", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                if row["id"] not in self.person_index:
+                    self.add_person(row["id"], row["name"], row["birth"])
+        self.names = NameIndex.build(self.person_names)
+
+        # Load movies, keeping the first row of a repeated id
+        with open(f"{directory}/movies.csv", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                if row["id"] not in self.movie_index:
+                    self.add_movie(row["id"], row["title"], row["year"])
+
+        # Load stars as parallel edge arrays, skipping unknown ids;
+        # repeated credits are dropped when the CSR rows are built
+        edge_people = array(INDEX)
+        edge_movies = array(INDEX)
+        with open(f"{directory}/stars.csv", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                person = self.person_index.get(row["person_id"])
+                movie = self.movie_index.get(row["movie_id"])
+                if person is None or movie is None:
+                    continue
+                edge_people.append(person)
+                edge_movies.append(movie)
+
+        self.person_offsets, self.person_movies = build_csr(
+            len(self.person_ids), edge_people, edge_movies
+        )
+        self.movie_offsets, self.movie_people = build_csr(
+            len(self.movie_ids), edge_movies, edge_people
+        )
+        self.label_components()
+
+    def label_components(self):
+        """
+        Label every person with a dense connected component id,
+        using union-find over the cast of each movie.
+        """
+        parents = array(INDEX, range(len(self.person_ids)))
+        sizes = array(INDEX, [1]) * len(self.person_ids)
+
+        def find(person):
+            while parents[person] != person:
+                parents[person] = parents[parents[person]]
+                person = parents[person]
+            return person
+
+        for movie in range(len(self.movie_ids)):
+            stars = self.stars_of(movie)
+            if not stars:
+                continue
+            root = find(stars[0])
+            for star in stars[1:]:
+                other = find(star)
+                if other == root:
+                    continue
+                if sizes[other] > sizes[root]:
+                    root, other = other, root
+                parents[other] = root
+                sizes[root] += sizes[other]
+
+        # Renumber roots densely in order of first appearance
+        labels = {}
+        self.components = array(INDEX, [0]) * len(self.person_ids)
+        self.component_sizes = array(INDEX)
+        for person in range(len(self.person_ids)):
+            root = find(person)
+            if root not in labels:
+                labels[root] = len(labels)
+                self.component_sizes.append(sizes[root])
+            self.components[person] = labels[root]
+
+    def connected(self, source, target):
+        """
+        Returns True if two people are in the same connected component.
+        """
+        return self.components[source] == self.components[target]
+
+    def component_size(self, person):
+        """
+        Returns the number of people in a person's connected component.
+        """
+        return self.component_sizes[self.components[person]]
+
+    def apply_delta(self, directory):
+        """
+        Add the people, movies and stars in the CSV files of `directory`
+        to the loaded graph, keeping the name index and component labels
+        up to date. Any of the three files may be missing, and rows for
+        ids or credits the graph already has are skipped.
+        Returns a Delta describing what changed.
+        Raises FileNotFoundError if `directory` is not a directory, and
+        ValueError (or csv.Error) if a file is malformed.
+        """
+        if not os.path.isdir(directory):
+            raise FileNotFoundError(f"No such delta directory: {directory}")
+
+        # Read and check every file before changing anything, so a bad
+        # file leaves the graph as it was
+        people = read_rows(directory, "people.csv")
+        movies = read_rows(directory, "movies.csv")
+        stars = read_rows(directory, "stars.csv")
+
+        delta = Delta()
+
+        # Add new people and movies, each in its own empty row
+        for row in people:
+            if row["id"] not in self.person_index:
+                delta.people.append(
+                    self.add_person(row["id"], row["name"], row["birth"])
+                )
+        for row in movies:
+            if row["id"] not in self.movie_index:
+                delta.movies.append(
+                    self.add_movie(row["id"], row["title"], row["year"])
+                )
+        self.person_offsets = grow_offsets(
+            self.person_offsets, len(delta.people)
+        )
+        self.movie_offsets = grow_offsets(
+            self.movie_offsets, len(delta.movies)
+        )
+        self.components = writable(self.components)
+        self.component_sizes = writable(self.component_sizes)
+        for person in delta.people:
+            self.components.append(len(self.component_sizes))
+            self.component_sizes.append(1)
+            self.names.add(person)
+
+        # Collect credits the graph does not have yet
+        person_additions = {}
+        movie_additions = {}
+        for row in stars:
+            person = self.person_index.get(row["person_id"])
+            movie = self.movie_index.get(row["movie_id"])
+            if person is None or movie is None:
+                continue
+            if movie in person_additions.get(person, []):
+                continue
+            if movie in self.movies_of(person):
+                continue
+            person_additions.setdefault(person, []).append(movie)
+            movie_additions.setdefault(movie, []).append(person)
+            delta.stars += 1
+        if not delta.stars:
+            return delta
+
+        self.person_offsets, self.person_movies = merge_csr(
+            self.person_offsets, self.person_movies, person_additions
+        )
+        self.movie_offsets, self.movie_people = merge_csr(
+            self.movie_offsets, self.movie_people, movie_additions
+        )
+        self.merge_components(movie_additions, delta)
+        return delta
+
+    def merge_components(self, movies, delta):
+        """
+        Merge the components joined by new credits in `movies`,
+        recording every label that was involved in `delta.components`.
+        """
+        roots = {}
+
+        def find(label):
+            while roots.get(label, label) != label:
+                label = roots[label]
+            return label
+
+        for movie in movies:
+            stars = self.stars_of(movie)
+            labels = {self.components[star] for star in stars}
+            delta.components.update(labels)
+            root = find(self.components[stars[0]])
+            for label in labels:
+                other = find(label)
+                if other == root:
+                    continue
+                if self.component_sizes[other] > self.component_sizes[root]:
+                    root, other = other, root
+                roots[other] = root
+                self.component_sizes[root] += self.component_sizes[other]
+                self.component_sizes[other] = 0
+
+        if roots:
+            merged = {label: find(label) for label in roots}
+            self.components = array(INDEX, (
+                merged.get(label, label) for label in self.components
+            ))
+
+    def add_person(self, person_id, name, birth):
+        """
+        Register a person and return their dense index.
+        The name index is maintained separately by `load` and `apply_delta`.
+        """
+        person = len(self.person_ids)
+        self.person_ids.append(person_id)
+        self.person_names.append(name)
+        self.person_births.append(sys.intern(birth))
+        self.person_index[person_id] = person
+        return person
+
+    def add_movie(self, movie_id, title, year):
+        """
+        Register a movie and return its dense index.
+        """
+        movie = len(self.movie_ids)
+        self.movie_ids.append(movie_id)
+        self.movie_titles.append(title)
+        self.movie_years.append(sys.intern(year))
+        self.movie_index[movie_id] = movie
+        return movie
+
+    def movies_of(self, person):
+        """
+        Returns the movie indices a person starred in.
+        """
+        return self.person_movies[
+            self.person_offsets[person]:self.person_offsets[person + 1]
+        ]
+
+    def stars_of(self, movie):
+        """
+        Returns the person indices who starred in a movie.
+        """
+        return self.movie_people[
+            self.movie_offsets[movie]:self.movie_offsets[movie + 1]
+        ]
+
+    def neighbors(self, person):
+        """
+        Yields (movie, person) index pairs for people
+        who starred with a given person.
+        """
+        for movie in self.movies_of(person):
+            for other in self.stars_of(movie):
+                yield movie, other
+
+
+def build_csr(count, sources, targets):
+    """
+    Group an edge list by source with a counting sort.
+    Returns (offsets, neighbors) arrays where the targets of
+    source `s` are `neighbors[offsets[s]:offsets[s + 1]]`.
+    """
+    offsets = array(INDEX, [0]) * (count + 1)
+    for source in sources:
+        offsets[source + 1] += 1
+    for i in range(count):
+        offsets[i + 1] += offsets[i]
+
+    neighbors = array(INDEX, [0]) * len(sources)
+    cursor = offsets[:-1]
+    for source, target in zip(sources, targets):
+        neighbors[cursor[source]] = target
+        cursor[source] += 1
+    return unique_rows(offsets, neighbors)
+
+
+def unique_rows(offsets, neighbors):
+    """
+    Returns (offsets, neighbors) with repeated targets dropped from each
+    row, keeping the first. The arrays are returned as they are if no row
+    repeats a target.
+    """
+    repeated = [
+        source for source in range(len(offsets) - 1)
+        if offsets[source + 1] - offsets[source] > 1
+        and len(set(neighbors[offsets[source]:offsets[source + 1]]))
+        < offsets[source + 1] - offsets[source]
+    ]
+    if not repeated:
+        return offsets, neighbors
+
+    new_offsets = array(INDEX, [0])
+    new_neighbors = array(INDEX)
+    row = 0
+    for source in repeated:
+        new_neighbors.extend(neighbors[offsets[row]:offsets[source]])
+        new_neighbors.extend(dict.fromkeys(
+            neighbors[offsets[source]:offsets[source + 1]]
+        ))
+        row = source + 1
+    new_neighbors.extend(neighbors[offsets[row]:])
+
+    # Recount rows from the unique targets
+    unique = set(repeated)
+    shift = 0
+    for source in range(len(offsets) - 1):
+        if source in unique:
+            length = offsets[source + 1] - offsets[source]
+            shift += length - len(set(
+                neighbors[offsets[source]:offsets[source + 1]]
+            ))
+        new_offsets.append(offsets[source + 1] - shift)
+    return new_offsets, new_neighbors
+
+
+def merge_csr(offsets, neighbors, additions):
+    """
+    Returns new (offsets, neighbors) arrays with the targets in
+    `additions`, a dict of source to list of new targets, appended to
+    their source's row. Untouched runs of rows are copied in bulk.
+    """
+    neighbors = writable(neighbors)
+    new_offsets = array(INDEX)
+    new_neighbors = array(INDEX)
+    shift = 0
+    row = 0
+    for source in sorted(additions):
+        new_neighbors.extend(neighbors[offsets[row]:offsets[source + 1]])
+        new_offsets.extend(offset + shift for offset in offsets[row:source + 1])
+        new_neighbors.extend(additions[source])
+        shift += len(additions[source])
+        row = source + 1
+    new_neighbors.extend(neighbors[offsets[row]:])
+    new_offsets.extend(offset + shift for offset in offsets[row:])
+    return new_offsets, new_neighbors
+
+
+def grow_offsets(offsets, rows):
+    """
+    Returns `offsets` extended with `rows` new empty rows.
+    """
+    if not rows:
+        return offsets
+    offsets = writable(offsets)
+    offsets.extend([offsets[-1]] * rows)
+    return offsets
+
+
+def read_rows(directory, filename):
+    """
+    Returns the rows of a CSV file in `directory`, or no rows if it is
+    missing. Raises ValueError if the file lacks one of its COLUMNS, in
+    the header or in a row.
+    """
+    path = os.path.join(directory, filename)
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        for column in COLUMNS[filename]:
+            if column not in (reader.fieldnames or [column]):
+                raise ValueError(f"{filename}: no {column} column")
+        rows = []
+        for row in reader:
+            for column in COLUMNS[filename]:
+                if row[column] is None:
+                    raise ValueError(
+                        f"{filename} line {reader.line_num}: "
+                        f"missing {column}"
+                    )
+            rows.append(row)
+    return rows
+
+
+class Delta():
+    """
+    Summary of one `Graph.apply_delta` call: the new person and movie
+    indices, the number of new credits, and the component labels
+    (as they were before the update) that new credits touched.
+    """
+
+    def __init__(self):
+        self.people = []
+        self.movies = []
+        self.stars = 0
+        self.components = set()
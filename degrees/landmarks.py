@@ -0,0 +1,139 @@
+import math
+import sys
+
+import degrees
+from parallel import distance_arrays
+from search import search_astar
+
+# Number of landmarks used when none is given
+LANDMARKS = 16
+
+
+def main():
+    if len(sys.argv) not in [2, 3]:
+        sys.exit("Usage: python landmarks.py directory [landmarks]")
+    directory = sys.argv[1]
+    count = int(sys.argv[2]) if len(sys.argv) == 3 else LANDMARKS
+
+    print("Loading data...")
+    degrees.load_data(directory)
+    print("Data loaded.")
+
+    print("Computing landmark distances...")
+    oracle = LandmarkOracle.build(degrees.graph, count, directory=directory)
+    names = [degrees.graph.person_names[landmark]
+             for landmark in oracle.landmarks]
+    print(f"Landmarks: {', '.join(names)}")
+
+    source = degrees.person_id_for_name(input("Name: "))
+    if source is None:
+        sys.exit("Person not found.")
+    target = degrees.person_id_for_name(input("Name: "))
+    if target is None:
+        sys.exit("Person not found.")
+
+    lower, upper = oracle.bounds(
+        degrees.graph.person_index[source], degrees.graph.person_index[target]
+    )
+    if lower == math.inf:
+        print("Not connected.")
+    elif upper == math.inf:
+        print(f"At least {lower} degrees of separation.")
+    elif lower == upper:
+        print(f"{lower} degrees of separation.")
+    else:
+        print(f"Between {lower} and {upper} degrees of separation.")
+
+
+class LandmarkOracle():
+    """
+    Distance oracle built from BFS distances to a few landmark people.
+
+    By the triangle inequality, for every landmark L the distance between
+    two people s and t lies between |d(s, L) - d(t, L)| and d(s, L) + d(L, t).
+    """
+
+    def __init__(self, graph, landmarks, distances):
+        self.graph = graph
+        self.landmarks = landmarks
+        self.distances = distances
+
+    @classmethod
+    def build(cls, graph, count=LANDMARKS, directory=None, processes=None):
+        """
+        Pick the `count` best connected people as landmarks and compute
+        their distance arrays.
+
+        If `directory` is given, the BFS runs in a pool of worker processes
+        (see `parallel.distance_arrays`); otherwise it runs in this process.
+        """
+        landmarks = choose_landmarks(graph, count)
+        distances = list(
+            distance_arrays(graph, landmarks, directory, processes)
+        )
+        return cls(graph, landmarks, distances)
+
+    def bounds(self, source, target):
+        """
+        Returns (lower, upper) bounds on the degrees of separation between
+        two people. Both are math.inf if they are known not to be connected;
+        only upper is math.inf if no landmark reaches them.
+        """
+        if source == target:
+            return 0, 0
+        if not self.graph.connected(source, target):
+            return math.inf, math.inf
+        lower = 1
+        upper = math.inf
+        for distances in self.distances:
+            to_source = distances[source]
+            to_target = distances[target]
+            if to_source == -1:
+                continue
+            lower = max(lower, abs(to_source - to_target))
+            upper = min(upper, to_source + to_target)
+        return lower, upper
+
+    def lower(self, source, target):
+        """
+        Returns a lower bound on the degrees of separation between two people.
+        """
+        return self.bounds(source, target)[0]
+
+    def upper(self, source, target):
+        """
+        Returns an upper bound on the degrees of separation between two people.
+        """
+        return self.bounds(source, target)[1]
+
+    def search(self, graph, source, target, stats=None):
+        """
+        A* search guided by the landmark lower bound, usable as a
+        `degrees.shortest_path` engine.
+        """
+        return search_astar(
+            graph, source, target,
+            lambda person: self.lower(person, target), stats
+        )
+
+
+def choose_landmarks(graph, count):
+    """
+    Returns the `count` people with the most co-star links,
+    favouring people from the largest components.
+    """
+    links = {}
+    for person in range(len(graph.person_ids)):
+        links[person] = sum(
+            len(graph.stars_of(movie)) for movie in graph.movies_of(person)
+        )
+    ranked = sorted(
+        links,
+        key=lambda person: (graph.component_size(person), links[person]),
+        reverse=True
+    )
+    return ranked[:count]
+
+
+if __name__ == "__main__":
+    main()
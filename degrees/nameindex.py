@@ -0,0 +1,215 @@
+import math
+from array import array
+from bisect import bisect_left, insort
+from collections import Counter
+
+from util import INDEX, writable
+
+# Smallest trigram similarity for a fuzzy match
+SIMILARITY = 0.3
+
+# Most people a fuzzy lookup scores exactly, taken by trigrams shared
+# within the rarest postings
+CANDIDATES = 200
+
+
+class NameIndex():
+    """
+    Exact, prefix and fuzzy lookup over the person names of a graph.
+
+    The index never copies names: `order` holds person indices sorted by
+    lowercase name, and trigram postings are stored CSR-style, with the
+    people whose name contains `trigram_keys[i]` in
+    `trigram_people[trigram_offsets[i]:trigram_offsets[i + 1]]`, in
+    increasing order. `trigram_counts` holds the number of distinct
+    trigrams in each person's name. People added after the index was
+    built have their trigrams in `extra_postings` instead.
+    """
+
+    def __init__(self, names, order, trigram_keys, trigram_offsets,
+                 trigram_people, trigram_counts):
+        self.names = names
+        self.order = order
+        self.trigram_keys = trigram_keys
+        self.trigram_offsets = trigram_offsets
+        self.trigram_people = trigram_people
+        self.trigram_counts = trigram_counts
+        self.trigram_rows = {
+            trigram: row for row, trigram in enumerate(trigram_keys)
+        }
+        self.extra_postings = {}
+
+    @classmethod
+    def build(cls, names):
+        """
+        Builds the index for a list of names, where list position is
+        the person index.
+        """
+        order = array(INDEX, sorted(
+            range(len(names)), key=lambda person: names[person].lower()
+        ))
+
+        postings = {}
+        trigram_counts = array(INDEX)
+        for person, name in enumerate(names):
+            found = trigrams(name)
+            trigram_counts.append(len(found))
+            for trigram in found:
+                postings.setdefault(trigram, array(INDEX)).append(person)
+
+        trigram_keys = sorted(postings)
+        trigram_offsets = array(INDEX, [0])
+        trigram_people = array(INDEX)
+        for trigram in trigram_keys:
+            trigram_people.extend(postings[trigram])
+            trigram_offsets.append(len(trigram_people))
+        return cls(names, order, trigram_keys, trigram_offsets, trigram_people,
+                   trigram_counts)
+
+    def add(self, person):
+        """
+        Adds a person appended to the names list after the index was built.
+        """
+        self.order = writable(self.order)
+        self.trigram_counts = writable(self.trigram_counts)
+        insort(
+            self.order, person, key=lambda person: self.names[person].lower()
+        )
+        found = trigrams(self.names[person])
+        self.trigram_counts.append(len(found))
+        for trigram in found:
+            self.extra_postings.setdefault(trigram, []).append(person)
+
+    def exact(self, name):
+        """
+        Returns the people whose name matches `name`, ignoring case.
+        """
+        name = name.lower()
+        start = self.bisect(name)
+        end = start
+        while end < len(self.order) and self.key(end) == name:
+            end += 1
+        return list(self.order[start:end])
+
+    def prefix(self, prefix, limit=None):
+        """
+        Returns people whose name starts with `prefix`, ignoring case,
+        in alphabetical order.
+        """
+        prefix = prefix.lower()
+        start = self.bisect(prefix)
+        end = start
+        while end < len(self.order) and self.key(end).startswith(prefix):
+            end += 1
+            if limit is not None and end - start == limit:
+                break
+        return list(self.order[start:end])
+
+    def fuzzy(self, name, limit=10, similarity=SIMILARITY):
+        """
+        Returns up to `limit` (person, score) pairs whose names share the
+        most trigrams with `name`, best first.
+        """
+        wanted = trigrams(name)
+        postings = sorted(
+            (self.posting(trigram) for trigram in wanted), key=len
+        )
+
+        # A match must share at least `required` trigrams, so it must
+        # appear in one of the len(wanted) - required + 1 rarest postings
+        required = max(1, math.ceil(similarity * len(wanted)))
+        rare = len(wanted) - required + 1
+        shared = Counter()
+        for posting in postings[:rare]:
+            shared.update(posting)
+
+        # Finish counting for the people sharing the most rare trigrams,
+        # looking them up in the sorted common postings
+        candidates = top(shared, CANDIDATES)
+        for posting in postings[rare:]:
+            for person in candidates:
+                position = bisect_left(posting, person)
+                if position < len(posting) and posting[position] == person:
+                    shared[person] += 1
+
+        scored = []
+        for person in candidates:
+            score = shared[person] / (
+                len(wanted) + self.trigram_counts[person] - shared[person]
+            )
+            if score >= similarity:
+                scored.append((person, score))
+        scored.sort(key=lambda pair: (-pair[1], self.names[pair[0]]))
+        return scored[:limit]
+
+    def search(self, query, limit=10):
+        """
+        Returns up to `limit` ranked person indices for a query:
+        exact matches, then prefix matches, then fuzzy matches.
+        """
+        ranked = Counter()
+        for person in self.exact(query):
+            ranked[person] = 3
+        for person in self.prefix(query, limit):
+            ranked[person] = max(ranked[person], 2)
+        for person, score in self.fuzzy(query, limit):
+            ranked[person] = max(ranked[person], score)
+        return [person for person, _ in ranked.most_common(limit)]
+
+    def key(self, position):
+        """
+        Returns the lowercase name at a position in sorted order.
+        """
+        return self.names[self.order[position]].lower()
+
+    def bisect(self, name):
+        """
+        Returns the first sorted position whose name is not below `name`.
+        """
+        return bisect_left(
+            self.order, name, key=lambda person: self.names[person].lower()
+        )
+
+    def posting(self, trigram):
+        """
+        Returns the people whose name contains a trigram.
+        """
+        row = self.trigram_rows.get(trigram)
+        if row is None:
+            people = []
+        else:
+            people = self.trigram_people[
+                self.trigram_offsets[row]:self.trigram_offsets[row + 1]
+            ]
+        if trigram in self.extra_postings:
+            people = list(people) + self.extra_postings[trigram]
+        return people
+
+
+def top(counts, limit):
+    """
+    Returns the people with the highest counts: everyone whose count is
+    at least the highest count that keeps no more than `limit` of them,
+    or the first `limit` people with the highest count if there are
+    more of those.
+    """
+    if len(counts) <= limit:
+        return list(counts)
+    histogram = Counter(counts.values())
+    kept = 0
+    floor = None
+    for count in sorted(histogram, reverse=True):
+        if floor is not None and kept + histogram[count] > limit:
+            break
+        kept += histogram[count]
+        floor = count
+    return [person for person, count in counts.items()
+            if count >= floor][:limit]
+
+
+def trigrams(name):
+    """
+    Returns the set of lowercase character trigrams in a padded name.
+    """
+    padded = f"  {name.lower()} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
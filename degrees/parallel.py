@@ -0,0 +1,63 @@
+import multiprocessing
+
+import snapshot
+from graph import Graph
+from search import bfs_distances
+
+# Graph used by each worker process: inherited from the parent when
+# workers are forked, otherwise loaded once from the dataset's snapshot
+worker_graph = None
+
+
+def distance_arrays(graph, sources, directory=None, processes=None):
+    """
+    Yields the `search.bfs_distances` array of every source, in order.
+
+    If `directory` is given, the searches run in a pool of worker processes.
+    Where processes can be forked, workers share the already-loaded graph;
+    otherwise each loads it once from the dataset's snapshot, and a
+    FileNotFoundError is raised if there is no up-to-date snapshot rather
+    than have every worker parse the CSV files. Without `directory` the
+    searches run one after another in this process.
+    """
+    if directory is None:
+        for source in sources:
+            yield bfs_distances(graph, source)
+        return
+
+    global worker_graph
+    if "fork" in multiprocessing.get_all_start_methods():
+        worker_graph = graph
+        context = multiprocessing.get_context("fork")
+        initializer, initargs = None, ()
+    elif snapshot.is_fresh(directory):
+        context = multiprocessing.get_context()
+        initializer, initargs = load_worker, (directory,)
+    else:
+        raise FileNotFoundError(
+            f"No up-to-date snapshot in {directory}; "
+            "run snapshot.py to write one"
+        )
+
+    try:
+        with context.Pool(processes, initializer, initargs) as pool:
+            yield from pool.imap(worker_distances, sources)
+    finally:
+        worker_graph = None
+
+
+def load_worker(directory):
+    """
+    Loads the graph once in a worker process from the snapshot.
+    """
+    global worker_graph
+    worker_graph = Graph()
+    if not snapshot.load(worker_graph, directory):
+        raise FileNotFoundError(f"No up-to-date snapshot in {directory}")
+
+
+def worker_distances(source):
+    """
+    Computes one source's distance array in a worker process.
+    """
+    return bfs_distances(worker_graph, source)
@@ -0,0 +1,488 @@
+from array import array
+from collections import deque
+from time import perf_counter
+
+from stats import SearchStats
+from util import INDEX, Node, PriorityFrontier, QueueFrontier
+
+# Typecode for hop-count arrays (16-bit signed ints, -1 for unreachable)
+DISTANCE = "h"
+
+
+def search_bfs(graph, source, target, stats=None):
+    """
+    Breadth-first search over dense person indices.
+    Returns a list of (movie, person) index pairs, or None.
+    Counters and expansion time are recorded in `stats`, a SearchStats.
+    """
+
+    # Record counters in a throwaway SearchStats if none was given
+    if stats is None:
+        stats = SearchStats()
+
+    # Initialize frontier to just the starting position
+    start = Node(state=source, parent=None, action=None)
+    frontier = QueueFrontier()
+    frontier.add(start)
+
+    # Initialize an empty explored set
+    explored = set()
+
+    # Keep looping until solution found
+    while True:
+
+        # If nothing left in frontier, then no path
+        if frontier.empty():
+            return None
+
+        # Choose a node from the frontier
+        node = frontier.remove()
+        stats.explored += 1
+
+        # If node is the goal, then we have a solution
+        if node.state == target:
+            path = []
+            while node.parent is not None:
+                path.append((node.action, node.state))
+                node = node.parent
+            path.reverse()
+            return path
+
+        # Mark node as explored
+        explored.add(node.state)
+
+        # Add neighbors to frontier
+        expand_start = perf_counter()
+        for action, state in graph.neighbors(node.state):
+            stats.edges_scanned += 1
+            if not frontier.contains_state(state) and state not in explored:
+                child = Node(state=state, parent=node, action=action)
+                frontier.add(child)
+        stats.add_time("expand", perf_counter() - expand_start)
+        stats.frontier(len(frontier.frontier))
+
+
+def search_bidirectional(graph, source, target, stats=None):
+    """
+    Bidirectional breadth-first search over dense person indices.
+
+    Grows one BFS layer at a time from whichever side has the smaller
+    frontier, stopping as soon as the two searches meet.
+    Returns a list of (movie, person) index pairs, or None.
+    Counters and expansion time are recorded in `stats`, a SearchStats.
+    """
+    if stats is None:
+        stats = SearchStats()
+    if source == target:
+        return []
+
+    # Maps each reached person to (previous person, movie) towards its root
+    parents_source = {source: None}
+    parents_target = {target: None}
+    frontier_source = [source]
+    frontier_target = [target]
+
+    # Movies whose whole cast each side has already reached
+    movies_source = set()
+    movies_target = set()
+
+    while frontier_source and frontier_target:
+        stats.frontier(len(frontier_source) + len(frontier_target))
+
+        # Expand the cheaper side
+        expand_start = perf_counter()
+        if len(frontier_source) <= len(frontier_target):
+            frontier_source, meeting = expand_layer(
+                graph, frontier_source, parents_source, parents_target,
+                movies_source, stats
+            )
+        else:
+            frontier_target, meeting = expand_layer(
+                graph, frontier_target, parents_target, parents_source,
+                movies_target, stats
+            )
+        stats.add_time("expand", perf_counter() - expand_start)
+
+        if meeting is not None:
+            return join_paths(meeting, parents_source, parents_target)
+
+    return None
+
+
+def expand_layer(graph, frontier, parents, other_parents, movies_seen,
+                 stats):
+    """
+    Expands every person in `frontier` by one hop, recording parents.
+    Each movie's cast is scanned at most once per side.
+    Returns the next frontier and a person reached by both sides, if any.
+    """
+    next_frontier = []
+    for person in frontier:
+        stats.explored += 1
+        for movie in graph.movies_of(person):
+            if movie in movies_seen:
+                continue
+            movies_seen.add(movie)
+            stars = graph.stars_of(movie)
+            stats.edges_scanned += len(stars)
+            for neighbor in stars:
+                if neighbor in parents:
+                    continue
+                parents[neighbor] = (person, movie)
+                if neighbor in other_parents:
+                    return next_frontier, neighbor
+                next_frontier.append(neighbor)
+    return next_frontier, None
+
+
+def join_paths(meeting, parents_source, parents_target):
+    """
+    Builds the (movie, person) path through the person where both searches met.
+    """
+    path = []
+    person = meeting
+    while parents_source[person] is not None:
+        previous, movie = parents_source[person]
+        path.append((movie, person))
+        person = previous
+    path.reverse()
+
+    person = meeting
+    while parents_target[person] is not None:
+        following, movie = parents_target[person]
+        path.append((movie, following))
+        person = following
+    return path
+
+
+def search_lean(graph, source, target, stats=None):
+    """
+    Breadth-first search that walks the CSR arrays directly.
+
+    Parents live in flat arrays rather than Node objects, each movie's
+    cast is scanned at most once, and already-reached people are skipped
+    before anything is allocated for them.
+    Returns a list of (movie, person) index pairs, or None.
+    Counters and expansion time are recorded in `stats`, a SearchStats.
+    """
+    if stats is None:
+        stats = SearchStats()
+    if source == target:
+        return []
+
+    person_offsets = graph.person_offsets
+    person_movies = memoryview(graph.person_movies)
+    movie_offsets = graph.movie_offsets
+    movie_people = memoryview(graph.movie_people)
+
+    # Previous person and shared movie for every reached person, -1 if unreached
+    parents = array(INDEX, [-1]) * len(graph.person_ids)
+    via = array(INDEX, [-1]) * len(graph.person_ids)
+    movies_seen = bytearray(len(graph.movie_ids))
+    parents[source] = source
+
+    # Counters are kept in locals and copied into `stats` once at the end
+    explored = edges = peak = 0
+    found = False
+    expand_start = perf_counter()
+
+    frontier = deque([source])
+    while frontier and not found:
+        person = frontier.popleft()
+        explored += 1
+        start, end = person_offsets[person], person_offsets[person + 1]
+        for movie in person_movies[start:end]:
+            if movies_seen[movie]:
+                continue
+            movies_seen[movie] = 1
+            start, end = movie_offsets[movie], movie_offsets[movie + 1]
+            edges += end - start
+            for neighbor in movie_people[start:end]:
+                if parents[neighbor] != -1:
+                    continue
+                parents[neighbor] = person
+                via[neighbor] = movie
+                if neighbor == target:
+                    found = True
+                    break
+                frontier.append(neighbor)
+            if found:
+                break
+        if len(frontier) > peak:
+            peak = len(frontier)
+
+    stats.add_time("expand", perf_counter() - expand_start)
+    stats.explored += explored
+    stats.edges_scanned += edges
+    stats.frontier(peak)
+    if not found:
+        return None
+    return parent_path(parents, via, source, target)
+
+
+def parent_path(parents, via, source, target):
+    """
+    Builds the (movie, person) path to `target` from flat parent arrays.
+    """
+    path = []
+    person = target
+    while person != source:
+        path.append((via[person], person))
+        person = parents[person]
+    path.reverse()
+    return path
+
+
+def search_astar(graph, source, target, heuristic, stats=None):
+    """
+    A* search over dense person indices, where every hop costs 1.
+
+    `heuristic(person)` must never overestimate the number of hops
+    from `person` to `target`, so the first path found is shortest.
+    Returns a list of (movie, person) index pairs, or None.
+    Counters and expansion time are recorded in `stats`, a SearchStats.
+    """
+    if stats is None:
+        stats = SearchStats()
+    start = Node(state=source, parent=None, action=None)
+    frontier = PriorityFrontier()
+    frontier.add(start, heuristic(source))
+
+    # Fewest hops found so far to each person
+    costs = {source: 0}
+    explored = set()
+
+    while not frontier.empty():
+        node = frontier.remove()
+
+        # Skip stale entries for people already expanded via a cheaper node
+        if node.state in explored:
+            continue
+
+        if node.state == target:
+            path = []
+            while node.parent is not None:
+                path.append((node.action, node.state))
+                node = node.parent
+            path.reverse()
+            return path
+
+        explored.add(node.state)
+        stats.explored += 1
+        cost = costs[node.state] + 1
+        expand_start = perf_counter()
+        for action, state in graph.neighbors(node.state):
+            stats.edges_scanned += 1
+            if state in explored or costs.get(state, cost + 1) <= cost:
+                continue
+            costs[state] = cost
+            child = Node(state=state, parent=node, action=action)
+            frontier.add(child, cost + heuristic(state))
+        stats.add_time("expand", perf_counter() - expand_start)
+        stats.frontier(len(frontier.frontier))
+
+    return None
+
+
+def bfs_distances(graph, source):
+    """
+    Returns an array of hop counts from `source` to every person,
+    with -1 for people who cannot be reached.
+    """
+    distances = array(DISTANCE, [-1]) * len(graph.person_ids)
+    distances[source] = 0
+    frontier = deque([source])
+    while frontier:
+        person = frontier.popleft()
+        distance = distances[person] + 1
+        for _, neighbor in graph.neighbors(person):
+            if distances[neighbor] == -1:
+                distances[neighbor] = distance
+                frontier.append(neighbor)
+    return distances
+
+
+class SearchTree():
+    """
+    Single-source BFS tree over every person reachable from `root`.
+
+    `parents[p]` is the person one hop closer to the root (-1 if `p` is
+    unreachable, `root` for the root itself) and `movies[p]` the movie
+    they starred in together.
+    """
+
+    def __init__(self, graph, root):
+        self.root = root
+        self.parents = array(INDEX, [-1]) * len(graph.person_ids)
+        self.movies = array(INDEX, [-1]) * len(graph.person_ids)
+        self.parents[root] = root
+
+        frontier = deque([root])
+        while frontier:
+            person = frontier.popleft()
+            for movie, neighbor in graph.neighbors(person):
+                if self.parents[neighbor] == -1:
+                    self.parents[neighbor] = person
+                    self.movies[neighbor] = movie
+                    frontier.append(neighbor)
+
+    def reaches(self, person):
+        """
+        Returns True if `person` is connected to the root.
+        """
+        return self.parents[person] != -1
+
+    def path(self, source, target):
+        """
+        Returns the (movie, person) path between the root and another
+        person, in either direction, or None if they are not connected.
+        """
+        if source == self.root:
+            other = target
+        elif target == self.root:
+            other = source
+        else:
+            raise ValueError("path must start or end at the tree root")
+        if not self.reaches(other):
+            return None
+
+        # Walk from the other person up to the root
+        path = []
+        person = other
+        while person != self.root:
+            parent = self.parents[person]
+            path.append((self.movies[person], person, parent))
+            person = parent
+
+        if source == self.root:
+            path.reverse()
+            return [(movie, person) for movie, person, _ in path]
+        return [(movie, parent) for movie, _, parent in path]
+
+
+class ShortestPaths():
+    """
+    Every shortest path between two people, as a layered DAG.
+
+    A BFS from `source` finds the distance to `target`; a backward pass
+    then keeps only the (movie, person) links that step from one layer
+    to the next on the way to `target`. Paths through different movies
+    count as different paths. `length` is None if there is no path.
+    """
+
+    def __init__(self, graph, source, target, stats=None):
+        if stats is None:
+            stats = SearchStats()
+        self.source = source
+        self.target = target
+
+        # Maps each person on a shortest path to its (movie, person) links
+        # one layer closer to the target
+        self.successors = {}
+
+        # Number of distinct shortest paths from each person to the target
+        self.ways = {target: 1}
+
+        # People in different components can never be connected
+        if not graph.connected(source, target):
+            self.length = None
+            return
+
+        distances = self.distances(graph, stats)
+        if target not in distances:
+            self.length = None
+            return
+        self.length = distances[target]
+
+        # Walk back from the target one layer at a time
+        layer = {target}
+        for distance in range(self.length - 1, -1, -1):
+            previous = set()
+            for person in layer:
+                for movie in graph.movies_of(person):
+                    for other in graph.stars_of(movie):
+                        if distances.get(other) == distance:
+                            self.successors.setdefault(other, []).append(
+                                (movie, person)
+                            )
+                            previous.add(other)
+            for person in previous:
+                self.ways[person] = sum(
+                    self.ways[following]
+                    for _, following in self.successors[person]
+                )
+            layer = previous
+
+    def distances(self, graph, stats):
+        """
+        Returns BFS distances from the source, stopping once the target
+        is reached, so every layer before the target's is complete.
+        """
+        distances = {self.source: 0}
+        movies_seen = set()
+        layer = [self.source]
+        while layer and self.target not in distances:
+            stats.frontier(len(layer))
+            next_layer = []
+            for person in layer:
+                stats.explored += 1
+                for movie in graph.movies_of(person):
+                    if movie in movies_seen:
+                        continue
+                    movies_seen.add(movie)
+                    stars = graph.stars_of(movie)
+                    stats.edges_scanned += len(stars)
+                    for other in stars:
+                        if other not in distances:
+                            distances[other] = distances[person] + 1
+                            next_layer.append(other)
+            layer = next_layer
+        return distances
+
+    def count(self):
+        """
+        Returns the number of distinct shortest paths, without listing them.
+        """
+        if self.length is None:
+            return 0
+        return self.ways[self.source]
+
+    def paths(self, limit=None):
+        """
+        Yields shortest paths as lists of (movie, person) pairs,
+        at most `limit` of them if given.
+        """
+        if self.length is None:
+            return
+        if self.length == 0:
+            yield []
+            return
+
+        # Depth-first walk over the DAG; every branch reaches the target
+        produced = 0
+        path = []
+        stack = [iter(self.successors[self.source])]
+        while stack:
+            step = next(stack[-1], None)
+            if step is None:
+                stack.pop()
+                if path:
+                    path.pop()
+                continue
+            path.append(step)
+            if step[1] == self.target:
+                yield list(path)
+                produced += 1
+                if limit is not None and produced >= limit:
+                    return
+                path.pop()
+            else:
+                stack.append(iter(self.successors[step[1]]))
+
+
+# Search strategies selectable by name in degrees.shortest_path
+ENGINES = {
+    "bfs": search_bfs,
+    "bidirectional": search_bidirectional,
+    "lean": search_lean,
+}
@@ -0,0 +1,171 @@
+import mmap
+import os
+import struct
+import sys
+
+from graph import Graph
+from nameindex import NameIndex
+from util import INDEX
+
+# Snapshot file written next to the CSV files of a dataset
+FILENAME = "graph.snapshot"
+
+# Files the snapshot is compiled from
+SOURCES = ["people.csv", "movies.csv", "stars.csv"]
+
+MAGIC = b"DEGSNAP4"
+
+# Index arrays stored in the snapshot, in file order
+ARRAYS = [
+    "person_offsets", "person_movies", "movie_offsets", "movie_people",
+    "components", "component_sizes",
+    "names.order", "names.trigram_offsets", "names.trigram_people",
+    "names.trigram_counts",
+]
+
+# String tables stored in the snapshot, in file order
+STRINGS = [
+    "person_ids", "person_names", "person_births",
+    "movie_ids", "movie_titles", "movie_years",
+    "names.trigram_keys",
+]
+
+# Magic, byte order marker, then the byte length of every section
+HEADER = struct.Struct(f"=8sI{len(ARRAYS) + len(STRINGS)}Q")
+BYTE_ORDER = 0x01020304
+
+# Sections start on multiples of this many bytes so arrays can be cast in place
+ALIGNMENT = 8
+
+
+def main():
+    if len(sys.argv) != 2:
+        sys.exit("Usage: python snapshot.py directory")
+    directory = sys.argv[1]
+    graph = Graph()
+    graph.load(directory)
+    write(graph, directory)
+    print(f"Wrote {os.path.join(directory, FILENAME)}")
+
+
+def path_for(directory):
+    """
+    Returns the snapshot path for a dataset directory.
+    """
+    return os.path.join(directory, FILENAME)
+
+
+def is_fresh(directory):
+    """
+    Returns True if the snapshot exists and is newer than every source CSV.
+    """
+    try:
+        snapshot_time = os.path.getmtime(path_for(directory))
+    except OSError:
+        return False
+    for source in SOURCES:
+        try:
+            if os.path.getmtime(os.path.join(directory, source)) > snapshot_time:
+                return False
+        except OSError:
+            pass
+    return True
+
+
+def write(graph, directory):
+    """
+    Write the graph to a snapshot file in `directory`.
+    The file is written under a temporary name and moved into place.
+    """
+    sections = [bytes(field(graph, name)) for name in ARRAYS]
+    sections += [
+        "".join(f"{string}\0" for string in field(graph, name)).encode("utf-8")
+        for name in STRINGS
+    ]
+
+    path = path_for(directory)
+    temporary = f"{path}.tmp"
+    with open(temporary, "wb") as f:
+        f.write(HEADER.pack(
+            MAGIC, BYTE_ORDER, *[len(section) for section in sections]
+        ))
+        for section in sections:
+            f.write(bytes(padding(f.tell())))
+            f.write(section)
+    os.replace(temporary, path)
+
+
+def load(graph, directory):
+    """
+    Fill `graph` from the snapshot in `directory`.
+
+    Index arrays are memory-mapped rather than copied; string tables of
+    NUL-terminated strings are decoded into lists.
+    Returns False if there is no usable snapshot.
+    """
+    if not is_fresh(directory):
+        return False
+
+    with open(path_for(directory), "rb") as f:
+        try:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return False
+    if len(buffer) < HEADER.size:
+        return False
+    magic, byte_order, *lengths = HEADER.unpack_from(buffer)
+    if magic != MAGIC or byte_order != BYTE_ORDER:
+        return False
+
+    view = memoryview(buffer)
+    offset = HEADER.size
+    sections = []
+    for length in lengths:
+        offset += padding(offset)
+        sections.append(view[offset:offset + length])
+        offset += length
+
+    fields = {}
+    for name, section in zip(ARRAYS, sections):
+        fields[name] = section.cast(INDEX)
+    for name, section in zip(STRINGS, sections[len(ARRAYS):]):
+        fields[name] = str(section, "utf-8").split("\0")[:-1]
+
+    graph.clear()
+    for name in ARRAYS + STRINGS:
+        if not name.startswith("names."):
+            setattr(graph, name, fields[name])
+    people = len(graph.person_ids)
+    movies = len(graph.movie_ids)
+    graph.person_index = dict(zip(graph.person_ids, range(people)))
+    graph.movie_index = dict(zip(graph.movie_ids, range(movies)))
+    graph.names = NameIndex(
+        graph.person_names,
+        fields["names.order"],
+        fields["names.trigram_keys"],
+        fields["names.trigram_offsets"],
+        fields["names.trigram_people"],
+        fields["names.trigram_counts"],
+    )
+    return True
+
+
+def field(graph, name):
+    """
+    Returns a graph attribute by dotted name, such as "names.order".
+    """
+    value = graph
+    for attribute in name.split("."):
+        value = getattr(value, attribute)
+    return value
+
+
+def padding(offset):
+    """
+    Returns the number of bytes needed to align `offset`.
+    """
+    return -offset % ALIGNMENT
+
+
+if __name__ == "__main__":
+    main()
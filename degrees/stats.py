@@ -0,0 +1,131 @@
+import time
+from contextlib import contextmanager
+
+
+class SearchStats():
+    """
+    Counters and timings for a single shortest-path query.
+
+    Search engines fill in `explored` (people expanded), `frontier_peak`
+    (largest frontier seen) and `edges_scanned` (co-star links looked
+    at); callers time whole phases such as "resolve" or "search" into
+    `phases`, and engines add time spent expanding neighbors as "expand".
+    """
+
+    def __init__(self, engine=None):
+        self.engine = engine
+        self.explored = 0
+        self.frontier_peak = 0
+        self.edges_scanned = 0
+        self.path_length = None
+        self.cached = False
+        self.phases = {}
+        self.wall_time = 0.0
+
+    @contextmanager
+    def timing(self, phase):
+        """
+        Adds the time spent in a `with` block to a phase.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(phase, time.perf_counter() - start)
+
+    def add_time(self, phase, seconds):
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def frontier(self, size):
+        """
+        Records a frontier size, keeping the high-water mark.
+        """
+        if size > self.frontier_peak:
+            self.frontier_peak = size
+
+    def expansions_per_second(self):
+        seconds = self.phases.get("search", 0.0)
+        return self.explored / seconds if seconds else 0.0
+
+    def as_dict(self):
+        return {
+            "engine": self.engine,
+            "explored": self.explored,
+            "frontier_peak": self.frontier_peak,
+            "edges_scanned": self.edges_scanned,
+            "path_length": self.path_length,
+            "cached": self.cached,
+            "wall_time": self.wall_time,
+            "phases": dict(self.phases),
+        }
+
+
+class SearchReport():
+    """
+    Aggregates SearchStats over a batch of queries.
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.cached = 0
+        self.explored = 0
+        self.edges_scanned = 0
+        self.frontier_peak = 0
+        self.phases = {}
+        self.wall_times = []
+
+    def add(self, stats):
+        self.queries += 1
+        self.cached += stats.cached
+        self.explored += stats.explored
+        self.edges_scanned += stats.edges_scanned
+        self.frontier_peak = max(self.frontier_peak, stats.frontier_peak)
+        for phase, seconds in stats.phases.items():
+            self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+        self.wall_times.append(stats.wall_time)
+
+    def percentile(self, fraction):
+        """
+        Returns the wall time below which `fraction` of queries finished.
+        """
+        if not self.wall_times:
+            return 0.0
+        times = sorted(self.wall_times)
+        return times[min(len(times) - 1, int(fraction * len(times)))]
+
+    def summary(self):
+        search_time = self.phases.get("search", 0.0)
+        return {
+            "queries": self.queries,
+            "cached": self.cached,
+            "explored": self.explored,
+            "edges_scanned": self.edges_scanned,
+            "frontier_peak": self.frontier_peak,
+            "expansions_per_second":
+                self.explored / search_time if search_time else 0.0,
+            "p50": self.percentile(0.50),
+            "p90": self.percentile(0.90),
+            "p99": self.percentile(0.99),
+            "max": max(self.wall_times, default=0.0),
+            "phases": dict(self.phases),
+        }
+
+    def format(self):
+        """
+        Returns the summary as human-readable lines.
+        """
+        summary = self.summary()
+        lines = [
+            f"Queries: {summary['queries']} ({summary['cached']} cached)",
+            f"Explored: {summary['explored']} people, "
+            f"{summary['edges_scanned']} edges, "
+            f"frontier peak {summary['frontier_peak']}",
+            f"Expansions per second: {summary['expansions_per_second']:.0f}",
+            f"Latency: p50 {summary['p50'] * 1000:.2f} ms, "
+            f"p90 {summary['p90'] * 1000:.2f} ms, "
+            f"p99 {summary['p99'] * 1000:.2f} ms, "
+            f"max {summary['max'] * 1000:.2f} ms",
+        ]
+        for phase, seconds in sorted(summary["phases"].items()):
+            lines.append(f"  {phase}: {seconds:.3f} s")
+        return lines
@@ -0,0 +1,102 @@
+import csv
+import os
+import sys
+from collections import Counter
+
+import degrees
+from parallel import distance_arrays
+
+# Source used when none is given on the command line
+DEFAULT_SOURCES = ["Kevin Bacon"]
+
+
+def main():
+    if len(sys.argv) < 3:
+        sys.exit("Usage: python sweep.py directory output [name or id ...]")
+    directory = sys.argv[1]
+    output = sys.argv[2]
+
+    print("Loading data...")
+    degrees.load_data(directory)
+    print("Data loaded.")
+
+    graph = degrees.graph
+    names = sys.argv[3:] or DEFAULT_SOURCES
+    sources = [resolve(graph, value) for value in names]
+
+    print(f"Sweeping {len(sources)} source(s)...")
+    distances = list(distance_arrays(graph, sources, directory))
+    histograms = [histogram(array) for array in distances]
+
+    os.makedirs(output, exist_ok=True)
+    write_distances(
+        graph, sources, distances, os.path.join(output, "distances.csv")
+    )
+    write_histograms(
+        graph, sources, histograms, os.path.join(output, "histogram.csv")
+    )
+
+    for source, counts in zip(sources, histograms):
+        reached = sum(counts.values())
+        mean = sum(d * n for d, n in counts.items()) / reached if reached else 0
+        print(f"{graph.person_names[source]}: {reached} people reached, "
+              f"mean {mean:.2f} degrees, max {max(counts, default=0)} degrees")
+    print(f"Wrote {output}")
+
+
+def resolve(graph, value):
+    """
+    Returns the person index for an IMDB id or an unambiguous name.
+    """
+    person = graph.person_index.get(value)
+    if person is not None:
+        return person
+    people = graph.names.exact(value)
+    if len(people) != 1:
+        sys.exit(f"Person not found or ambiguous: {value}")
+    return people[0]
+
+
+def histogram(distances):
+    """
+    Returns a Counter of how many people sit at each distance,
+    leaving out people who cannot be reached.
+    """
+    counts = Counter(distances)
+    counts.pop(-1, None)
+    return counts
+
+
+def write_distances(graph, sources, distances, filename):
+    """
+    Write one row per person with their distance to every source,
+    left blank where they are not connected.
+    """
+    with open(filename, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(
+            ["person_id", "name"] + [graph.person_ids[s] for s in sources]
+        )
+        for person in range(len(graph.person_ids)):
+            row = [graph.person_ids[person], graph.person_names[person]]
+            for array in distances:
+                row.append(array[person] if array[person] != -1 else "")
+            writer.writerow(row)
+
+
+def write_histograms(graph, sources, histograms, filename):
+    """
+    Write how many people sit at each degree of separation from each source.
+    """
+    with open(filename, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["source_id", "degrees", "people"])
+        for source, counts in zip(sources, histograms):
+            for distance in sorted(counts):
+                writer.writerow(
+                    [graph.person_ids[source], distance, counts[distance]]
+                )
+
+
+if __name__ == "__main__":
+    main()
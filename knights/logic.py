@@ -1,5 +1,12 @@
+import functools
 import itertools
 
+import sat
+
+# Largest number of symbols model_check enumerates before switching to
+# the SAT solver
+ENUMERATION_LIMIT = 16
+
 
 class Sentence():
 
@@ -15,6 +22,28 @@ class Sentence():
         """Returns a set of all symbols in the logical sentence."""
         return set()
 
+    def expression(self, indices):
+        """
+        Returns Python source for the sentence over an integer model `m`,
+        where bit indices[name] of `m` is the value of symbol `name`.
+        """
+        raise Exception("nothing to compile")
+
+    def compile(self, symbols):
+        """
+        Returns a function that evaluates the sentence over an integer
+        model, where bit i holds the value of the symbol named symbols[i].
+        """
+        indices = {symbol: i for i, symbol in enumerate(symbols)}
+        return eval(f"lambda m: bool({self.expression(indices)})")
+
+    def encode(self, cnf):
+        """
+        Adds clauses to a CNF that define a literal equivalent to the
+        sentence, and returns that literal.
+        """
+        raise Exception("nothing to encode")
+
     @classmethod
     def validate(cls, sentence):
         if not isinstance(sentence, Sentence):
@@ -62,12 +91,21 @@ class Symbol(Sentence):
         except KeyError:
             raise Exception(f"variable {self.name} not in model")
 
+    def encode(self, cnf):
+        return cnf.variable(self.name)
+
     def formula(self):
         return self.name
 
     def symbols(self):
         return {self.name}
 
+    def expression(self, indices):
+        try:
+            return f"m >> {indices[self.name]} & 1"
+        except KeyError:
+            raise Exception(f"variable {self.name} not in model")
+
 
 class Not(Sentence):
     def __init__(self, operand):
@@ -92,6 +130,12 @@ class Not(Sentence):
     def symbols(self):
         return self.operand.symbols()
 
+    def expression(self, indices):
+        return f"not ({self.operand.expression(indices)})"
+
+    def encode(self, cnf):
+        return -cnf.literal(self.operand)
+
 
 class And(Sentence):
     def __init__(self, *conjuncts):
@@ -129,6 +173,17 @@ class And(Sentence):
     def symbols(self):
         return set.union(*[conjunct.symbols() for conjunct in self.conjuncts])
 
+    def expression(self, indices):
+        if not self.conjuncts:
+            return "True"
+        return " and ".join(f"({conjunct.expression(indices)})"
+                            for conjunct in self.conjuncts)
+
+    def encode(self, cnf):
+        return cnf.conjunction(
+            [cnf.literal(conjunct) for conjunct in self.conjuncts]
+        )
+
 
 class Or(Sentence):
     def __init__(self, *disjuncts):
@@ -160,6 +215,17 @@ class Or(Sentence):
     def symbols(self):
         return set.union(*[disjunct.symbols() for disjunct in self.disjuncts])
 
+    def expression(self, indices):
+        if not self.disjuncts:
+            return "False"
+        return " or ".join(f"({disjunct.expression(indices)})"
+                           for disjunct in self.disjuncts)
+
+    def encode(self, cnf):
+        return cnf.disjunction(
+            [cnf.literal(disjunct) for disjunct in self.disjuncts]
+        )
+
 
 class Implication(Sentence):
     def __init__(self, antecedent, consequent):
@@ -191,6 +257,15 @@ class Implication(Sentence):
     def symbols(self):
         return set.union(self.antecedent.symbols(), self.consequent.symbols())
 
+    def expression(self, indices):
+        return (f"not ({self.antecedent.expression(indices)})"
+                f" or ({self.consequent.expression(indices)})")
+
+    def encode(self, cnf):
+        return cnf.disjunction(
+            [-cnf.literal(self.antecedent), cnf.literal(self.consequent)]
+        )
+
 
 class Biconditional(Sentence):
     def __init__(self, left, right):
@@ -224,9 +299,217 @@ class Biconditional(Sentence):
     def symbols(self):
         return set.union(self.left.symbols(), self.right.symbols())
 
+    def expression(self, indices):
+        return (f"(not ({self.left.expression(indices)}))"
+                f" == (not ({self.right.expression(indices)}))")
+
+    def encode(self, cnf):
+        return cnf.equivalence(cnf.literal(self.left), cnf.literal(self.right))
+
+
+class CNF():
+    """
+    Clauses in conjunctive normal form for the SAT solver, built with
+    the Tseitin transformation: every compound subsentence gets a new
+    variable defined to be equivalent to it, so the clauses grow linearly
+    with the size of the sentences rather than exponentially.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.clauses = []
+        self.variables = {}
+        self.literals = {}
+
+    def new_variable(self):
+        self.count += 1
+        return self.count
+
+    def variable(self, name):
+        """
+        Returns the variable for a symbol name.
+        """
+        if name not in self.variables:
+            self.variables[name] = self.new_variable()
+        return self.variables[name]
+
+    def literal(self, sentence):
+        """
+        Returns a literal equivalent to a sentence, encoding each distinct
+        subsentence only once.
+        """
+        if sentence not in self.literals:
+            self.literals[sentence] = sentence.encode(self)
+        return self.literals[sentence]
+
+    def add(self, sentence):
+        """
+        Adds clauses requiring a sentence to be true.
+        """
+        if isinstance(sentence, And):
+            for conjunct in sentence.conjuncts:
+                self.add(conjunct)
+        elif isinstance(sentence, Or):
+            self.clauses.append(
+                [self.literal(disjunct) for disjunct in sentence.disjuncts]
+            )
+        elif isinstance(sentence, Implication):
+            self.clauses.append([-self.literal(sentence.antecedent),
+                                 self.literal(sentence.consequent)])
+        else:
+            self.clauses.append([self.literal(sentence)])
+
+    def conjunction(self, literals):
+        """
+        Returns a new variable defined as the conjunction of literals.
+        """
+        variable = self.new_variable()
+        for literal in literals:
+            self.clauses.append([-variable, literal])
+        self.clauses.append([variable] + [-literal for literal in literals])
+        return variable
+
+    def disjunction(self, literals):
+        """
+        Returns a new variable defined as the disjunction of literals.
+        """
+        variable = self.new_variable()
+        for literal in literals:
+            self.clauses.append([variable, -literal])
+        self.clauses.append([-variable] + literals)
+        return variable
+
+    def equivalence(self, left, right):
+        """
+        Returns a new variable defined as left <=> right.
+        """
+        variable = self.new_variable()
+        self.clauses.extend([
+            [-variable, -left, right],
+            [-variable, left, -right],
+            [variable, left, right],
+            [variable, -left, -right],
+        ])
+        return variable
+
+
+def model_check(knowledge, query, engine="auto"):
+    """
+    Checks if knowledge base entails query.
+
+    `engine` is "enumerate" to check every model, "sat" to ask the SAT
+    solver whether knowledge and not query is unsatisfiable, or "auto"
+    to enumerate up to ENUMERATION_LIMIT symbols and solve beyond.
+    """
+
+    # Get all symbols in both knowledge and query
+    symbols = tuple(sorted(set.union(knowledge.symbols(), query.symbols())))
+
+    if engine == "auto":
+        engine = "enumerate" if len(symbols) <= ENUMERATION_LIMIT else "sat"
+    if engine == "sat":
+        return sat_check(knowledge, query)
+    elif engine != "enumerate":
+        raise ValueError(f"Unknown engine {engine}")
+
+    # Compile both sentences to functions of an integer model, and check
+    # that the query holds in every model where knowledge does
+    try:
+        knowledge_holds = compiled(knowledge, symbols)
+        query_holds = compiled(query, symbols)
+    except (RecursionError, SyntaxError, MemoryError):
+        # Too deeply nested for the Python compiler
+        return model_check_tree(knowledge, query)
+    for model in range(2 ** len(symbols)):
+        if knowledge_holds(model) and not query_holds(model):
+            return False
+    return True
+
+
+@functools.lru_cache(maxsize=256)
+def compiled(sentence, symbols):
+    """
+    Returns sentence.compile(symbols), reusing the function when the same
+    sentence is checked again, e.g. against every query of a puzzle.
+    """
+    return sentence.compile(symbols)
+
+
+def model_check_many(knowledge, queries, engine="auto"):
+    """
+    Checks which of several queries the knowledge base entails.
+    Returns a list of bools, one per query.
+
+    The knowledge base is enumerated or solved once for all the queries;
+    `engine` is as for model_check.
+    """
+    queries = list(queries)
+    symbols = tuple(sorted(set.union(
+        knowledge.symbols(), *[query.symbols() for query in queries]
+    )))
+
+    if engine == "auto":
+        engine = "enumerate" if len(symbols) <= ENUMERATION_LIMIT else "sat"
+    if engine == "sat":
+        return sat_check_many(knowledge, queries)
+    elif engine != "enumerate":
+        raise ValueError(f"Unknown engine {engine}")
+
+    # Collect the models of the knowledge base, then check each query
+    # holds in all of them
+    try:
+        knowledge_holds = compiled(knowledge, symbols)
+        queries_hold = [compiled(query, symbols) for query in queries]
+    except (RecursionError, SyntaxError, MemoryError):
+        return [model_check_tree(knowledge, query) for query in queries]
+    models = [model for model in range(2 ** len(symbols))
+              if knowledge_holds(model)]
+    return [all(query_holds(model) for model in models)
+            for query_holds in queries_hold]
+
+
+def sat_check(knowledge, query):
+    """
+    Checks if knowledge base entails query: it does exactly when no model
+    makes the knowledge base true and the query false.
+    """
+    cnf = CNF()
+    cnf.add(knowledge)
+    cnf.add(Not(query))
+    return sat.solve(cnf.count, cnf.clauses) is None
+
+
+def sat_check_many(knowledge, queries):
+    """
+    Checks which queries a knowledge base entails with the SAT solver.
+    One model of the knowledge base rules out every query it makes
+    false; only the remaining queries need a solver run of their own.
+    """
+    cnf = CNF()
+    cnf.add(knowledge)
+    literals = [cnf.literal(query) for query in queries]
+    model = sat.solve(cnf.count, cnf.clauses)
+
+    # Nothing is consistent with the knowledge base, so it entails anything
+    if model is None:
+        return [True] * len(literals)
+
+    results = []
+    for literal in literals:
+        if model[abs(literal)] != (literal > 0):
+            results.append(False)
+        else:
+            results.append(
+                sat.solve(cnf.count, cnf.clauses + [[-literal]]) is None
+            )
+    return results
+
 
-def model_check(knowledge, query):
-    """Checks if knowledge base entails query."""
+def model_check_tree(knowledge, query):
+    """
+    Checks if knowledge base entails query, evaluating the sentence
+    trees on dict models.
+    """
 
     def check_all(knowledge, query, symbols, model):
         """Checks if knowledge base entails query, given a particular model."""
@@ -0,0 +1,288 @@
+"""
+Conflict-driven clause learning (CDCL) SAT solver.
+
+Variables are numbered from 1, and a literal is +v or -v for variable v
+being true or false. A clause is a list of literals, at least one of
+which must hold.
+"""
+
+import heapq
+
+# Activity decay: recent conflicts count more when choosing variables
+DECAY = 0.95
+
+# Conflicts before the first restart, and how much each restart waits
+# longer than the one before
+RESTART = 100
+RESTART_GROWTH = 1.5
+
+
+class Solver():
+    """
+    DPLL search with unit propagation over two watched literals per
+    clause, first-UIP clause learning with non-chronological
+    backtracking, activity-based branching, phase saving and restarts.
+    """
+
+    def __init__(self, count, clauses=()):
+        self.count = count
+        self.clauses = []
+        self.learnt = []
+
+        # Clauses watching each literal, checked when it becomes false
+        self.watches = {}
+        for variable in range(1, count + 1):
+            self.watches[variable] = []
+            self.watches[-variable] = []
+
+        # Assignment, decision level and implying clause of each variable
+        self.values = [None] * (count + 1)
+        self.levels = [0] * (count + 1)
+        self.reasons = [None] * (count + 1)
+        self.phases = [False] * (count + 1)
+
+        # Assigned literals in order, where each decision level starts,
+        # and how far the trail has been propagated
+        self.trail = []
+        self.trail_levels = []
+        self.propagated = 0
+
+        self.activity = [0.0] * (count + 1)
+        self.bump = 1.0
+        self.order = [(0.0, variable) for variable in range(1, count + 1)]
+
+        self.unsatisfiable = False
+        self.conflicts = 0
+        self.decisions = 0
+
+        for clause in clauses:
+            self.add_clause(clause)
+
+    def add_clause(self, clause):
+        """
+        Adds a clause before solving. Returns False if the clauses are
+        now known to be unsatisfiable.
+        """
+        literals = []
+        for literal in clause:
+            if -literal in literals:
+                return True
+            if literal not in literals:
+                literals.append(literal)
+
+        # Drop literals already false, and clauses already true
+        if any(self.value(literal) is True for literal in literals):
+            return True
+        literals = [literal for literal in literals
+                    if self.value(literal) is None]
+
+        if not literals:
+            self.unsatisfiable = True
+        elif len(literals) == 1:
+            self.assign(literals[0], None)
+            if self.propagate() is not None:
+                self.unsatisfiable = True
+        else:
+            self.clauses.append(literals)
+            self.watch(literals)
+        return not self.unsatisfiable
+
+    def solve(self):
+        """
+        Returns a satisfying model as a dict from variable to bool,
+        or None if the clauses are unsatisfiable.
+        """
+        if self.unsatisfiable:
+            return None
+        restart = RESTART
+        since_restart = 0
+        while True:
+            conflict = self.propagate()
+            if conflict is not None:
+                self.conflicts += 1
+                since_restart += 1
+                if not self.trail_levels:
+                    self.unsatisfiable = True
+                    return None
+                learnt, level = self.analyze(conflict)
+                self.backtrack(level)
+                if len(learnt) == 1:
+                    self.assign(learnt[0], None)
+                else:
+                    self.learnt.append(learnt)
+                    self.watch(learnt)
+                    self.assign(learnt[0], learnt)
+                self.decay()
+            elif since_restart >= restart:
+                since_restart = 0
+                restart = int(restart * RESTART_GROWTH)
+                self.backtrack(0)
+            else:
+                variable = self.choose()
+                if variable is None:
+                    return {variable: value for variable, value
+                            in enumerate(self.values) if variable}
+                self.decisions += 1
+                self.trail_levels.append(len(self.trail))
+                self.assign(variable if self.phases[variable] else -variable,
+                            None)
+
+    def value(self, literal):
+        """
+        Returns True or False for an assigned literal, otherwise None.
+        """
+        value = self.values[abs(literal)]
+        if value is None:
+            return None
+        return value if literal > 0 else not value
+
+    def assign(self, literal, reason):
+        """
+        Makes a literal true at the current decision level.
+        """
+        variable = abs(literal)
+        self.values[variable] = literal > 0
+        self.levels[variable] = len(self.trail_levels)
+        self.reasons[variable] = reason
+        self.trail.append(literal)
+
+    def watch(self, clause):
+        """
+        Watches the first two literals of a clause.
+        """
+        self.watches[clause[0]].append(clause)
+        self.watches[clause[1]].append(clause)
+
+    def propagate(self):
+        """
+        Assigns every literal implied by unit clauses.
+        Returns a clause with every literal false, or None.
+        """
+        while self.propagated < len(self.trail):
+            false = -self.trail[self.propagated]
+            self.propagated += 1
+            watching = self.watches[false]
+            kept = 0
+            for position, clause in enumerate(watching):
+                # Keep the false literal second
+                if clause[0] == false:
+                    clause[0], clause[1] = clause[1], clause[0]
+
+                # Watch another literal that is not false, if there is one
+                if self.value(clause[0]) is not True:
+                    for other in range(2, len(clause)):
+                        if self.value(clause[other]) is not False:
+                            clause[1], clause[other] = clause[other], clause[1]
+                            self.watches[clause[1]].append(clause)
+                            break
+                    else:
+                        watching[kept] = clause
+                        kept += 1
+                        if self.value(clause[0]) is False:
+                            watching[kept:] = watching[position + 1:]
+                            return clause
+                        self.assign(clause[0], clause)
+                    continue
+                watching[kept] = clause
+                kept += 1
+            del watching[kept:]
+        return None
+
+    def analyze(self, conflict):
+        """
+        Returns a learnt clause whose only literal assigned at the current
+        level comes first (the first unique implication point), with the
+        level to backtrack to.
+        """
+        level = len(self.trail_levels)
+        seen = set()
+        learnt = [None]
+        pending = 0
+        clause = conflict
+        literal = None
+        position = len(self.trail) - 1
+        while True:
+            for other in clause if literal is None else clause[1:]:
+                variable = abs(other)
+                if variable not in seen and self.levels[variable] > 0:
+                    seen.add(variable)
+                    self.increase(variable)
+                    if self.levels[variable] == level:
+                        pending += 1
+                    else:
+                        learnt.append(other)
+
+            # Resolve on the latest seen literal assigned on the trail
+            while abs(self.trail[position]) not in seen:
+                position -= 1
+            literal = self.trail[position]
+            position -= 1
+            seen.discard(abs(literal))
+            pending -= 1
+            if pending == 0:
+                break
+            clause = self.reasons[abs(literal)]
+        learnt[0] = -literal
+
+        if len(learnt) == 1:
+            return learnt, 0
+
+        # Watch the literal from the highest remaining level second
+        highest = max(range(1, len(learnt)),
+                      key=lambda index: self.levels[abs(learnt[index])])
+        learnt[1], learnt[highest] = learnt[highest], learnt[1]
+        return learnt, self.levels[abs(learnt[1])]
+
+    def backtrack(self, level):
+        """
+        Undoes every assignment above a decision level.
+        """
+        if len(self.trail_levels) <= level:
+            return
+        start = self.trail_levels[level]
+        for literal in self.trail[start:]:
+            variable = abs(literal)
+            self.phases[variable] = literal > 0
+            self.values[variable] = None
+            self.reasons[variable] = None
+            heapq.heappush(self.order, (-self.activity[variable], variable))
+        del self.trail[start:]
+        del self.trail_levels[level:]
+        self.propagated = start
+
+    def choose(self):
+        """
+        Returns the unassigned variable with the highest activity,
+        or None if every variable is assigned.
+        """
+        while self.order:
+            _, variable = heapq.heappop(self.order)
+            if self.values[variable] is None:
+                return variable
+        return None
+
+    def increase(self, variable):
+        """
+        Raises the activity of a variable involved in a conflict.
+        """
+        self.activity[variable] += self.bump
+        if self.activity[variable] > 1e100:
+            self.activity = [activity * 1e-100 for activity in self.activity]
+            self.bump *= 1e-100
+            self.order = [(-self.activity[variable], variable)
+                          for variable in range(1, self.count + 1)
+                          if self.values[variable] is None]
+            heapq.heapify(self.order)
+        elif self.values[variable] is None:
+            heapq.heappush(self.order, (-self.activity[variable], variable))
+
+    def decay(self):
+        self.bump /= DECAY
+
+
+def solve(count, clauses):
+    """
+    Returns a model satisfying the clauses over variables 1..count,
+    or None if there is none.
+    """
+    return Solver(count, clauses).solve()
@@ -0,0 +1,88 @@
+"""
+Vectorized Tic Tac Toe functions over batches of boards.
+
+A batch is an N x 9 NumPy array with one board per row, where column
+3 * i + j holds cell (i, j) as 1 for X, -1 for O or 0 for EMPTY.
+Every function agrees with its scalar counterpart in tictactoe.py.
+"""
+
+import numpy as np
+
+import tictactoe as ttt
+
+# Cell values in a batch
+X = 1
+O = -1
+EMPTY = 0
+
+# Cells of every row, column and diagonal, in the order tictactoe.winner
+# checks them, so the first complete line decides the winner
+LINES = np.array([
+    [0, 1, 2], [3, 4, 5], [6, 7, 8],
+    [0, 3, 6], [1, 4, 7], [2, 5, 8],
+    [0, 4, 8], [2, 4, 6],
+])
+
+VALUES = {ttt.X: X, ttt.O: O, ttt.EMPTY: EMPTY}
+MARKERS = {X: ttt.X, O: ttt.O, EMPTY: ttt.EMPTY}
+
+
+def encode(boards):
+    """
+    Returns the batch for a list of list-of-lists boards.
+    """
+    return np.array(
+        [[VALUES[cell] for row in board for cell in row] for board in boards],
+        dtype=np.int8,
+    ).reshape(-1, 9)
+
+
+def decode(batch):
+    """
+    Returns the list-of-lists boards in a batch.
+    """
+    return [[[MARKERS[value] for value in row[3 * i:3 * i + 3]]
+             for i in range(3)] for row in np.asarray(batch).tolist()]
+
+
+def players(batch):
+    """
+    Returns the player with the next turn on each board, as X or O.
+    """
+    x = np.count_nonzero(batch == X, axis=1)
+    o = np.count_nonzero(batch == O, axis=1)
+    return np.where(x > o, O, X).astype(np.int8)
+
+
+def winners(batch):
+    """
+    Returns the winner of each board as X or O, or EMPTY if there is none.
+    """
+    sums = np.asarray(batch, dtype=np.int8)[:, LINES].sum(axis=2)
+    complete = np.abs(sums) == 3
+    first = complete.argmax(axis=1)
+    rows = np.arange(len(sums))
+    return np.where(complete[rows, first], np.sign(sums[rows, first]),
+                    EMPTY).astype(np.int8)
+
+
+def terminal(batch):
+    """
+    Returns True for each board whose game is over.
+    """
+    return (winners(batch) != EMPTY) | np.all(batch != EMPTY, axis=1)
+
+
+def utility(batch):
+    """
+    Returns 1 for each board X has won, -1 for each O has won, 0 otherwise.
+    """
+    return winners(batch)
+
+
+def legal_moves(batch):
+    """
+    Returns an N x 9 boolean mask of the empty cells of each board, the
+    same cells tictactoe.actions returns.
+    """
+    return np.asarray(batch) == EMPTY
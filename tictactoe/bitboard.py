@@ -0,0 +1,166 @@
+"""
+Bitboard representation of Tic Tac Toe positions.
+
+A state is a pair of 9-bit masks (x, o), where bit 3 * i + j is set if
+that player has played cell (i, j).
+"""
+
+# Same markers as tictactoe.py
+X = "X"
+O = "O"
+EMPTY = None
+
+# Mask with every cell set
+FULL = 0b111111111
+
+# Cells of every row, column and diagonal
+WIN_MASKS = [
+    0b000000111, 0b000111000, 0b111000000,
+    0b001001001, 0b010010010, 0b100100100,
+    0b100010001, 0b001010100,
+]
+
+# Whether each of the 512 possible masks contains a complete line
+WINNING = [any(mask & line == line for line in WIN_MASKS)
+           for mask in range(FULL + 1)]
+
+# Minimax value of every position searched so far
+values = {}
+
+# Number of positions evaluated by the most recent best_action call
+nodes_searched = 0
+
+
+def from_board(board):
+    """
+    Returns the (x, o) state for a list-of-lists board.
+    """
+    x = o = 0
+    for i in range(3):
+        for j in range(3):
+            if board[i][j] == X:
+                x |= 1 << (3 * i + j)
+            elif board[i][j] == O:
+                o |= 1 << (3 * i + j)
+    return x, o
+
+
+def to_board(state):
+    """
+    Returns the list-of-lists board for an (x, o) state.
+    """
+    x, o = state
+    return [[X if x >> (3 * i + j) & 1 else O if o >> (3 * i + j) & 1
+             else EMPTY for j in range(3)] for i in range(3)]
+
+
+def player(state):
+    """
+    Returns player who has the next turn.
+    """
+    x, o = state
+    return X if x.bit_count() == o.bit_count() else O
+
+
+def moves(state):
+    """
+    Returns the bit indices of all empty cells.
+    """
+    empty = FULL & ~(state[0] | state[1])
+    return [bit for bit in range(9) if empty >> bit & 1]
+
+
+def actions(state):
+    """
+    Returns set of all possible actions (i, j).
+    """
+    return {divmod(bit, 3) for bit in moves(state)}
+
+
+def result(state, action):
+    """
+    Returns the state after the current player plays action (i, j).
+    """
+    i, j = action
+    if not (0 <= i < 3 and 0 <= j < 3):
+        raise ValueError("Invalid action")
+    return play(state, 3 * i + j)
+
+
+def play(state, bit):
+    """
+    Returns the state after the current player plays a cell by bit index.
+    """
+    x, o = state
+    cell = 1 << bit
+    if (x | o) & cell:
+        raise ValueError("Cell is already played")
+    if x.bit_count() == o.bit_count():
+        return x | cell, o
+    return x, o | cell
+
+
+def winner(state):
+    """
+    Returns the winner of the game, if there is one.
+    """
+    x, o = state
+    if WINNING[x]:
+        return X
+    if WINNING[o]:
+        return O
+    return None
+
+
+def terminal(state):
+    """
+    Returns True if game is over, False otherwise.
+    """
+    x, o = state
+    return WINNING[x] or WINNING[o] or (x | o) == FULL
+
+
+def utility(state):
+    """
+    Returns 1 if X has won the game, -1 if O has won, 0 otherwise.
+    """
+    x, o = state
+    if WINNING[x]:
+        return 1
+    if WINNING[o]:
+        return -1
+    return 0
+
+
+def value(state):
+    """
+    Returns the minimax value of a state, memoized in `values`.
+    """
+    if state in values:
+        return values[state]
+
+    global nodes_searched
+    nodes_searched += 1
+
+    if terminal(state):
+        score = utility(state)
+    else:
+        scores = [value(play(state, bit)) for bit in moves(state)]
+        score = max(scores) if player(state) == X else min(scores)
+    values[state] = score
+    return score
+
+
+def best_action(state):
+    """
+    Returns the optimal action (i, j) for the current player,
+    or None if the game is over.
+    """
+    global nodes_searched
+    nodes_searched = 0
+
+    if terminal(state):
+        return None
+    sign = 1 if player(state) == X else -1
+    bit = max(moves(state), key=lambda bit: sign * value(play(state, bit)))
+    return divmod(bit, 3)
@@ -0,0 +1,341 @@
+"""
+Tic Tac Toe on an m x n board, where the first player to get k in a row
+wins.
+
+Boards are lists of lists, like in tictactoe.py. Boards too large to
+search exhaustively are played with iterative-deepening alpha-beta under
+a time budget, scoring unfinished positions with a heuristic and keeping
+searched positions in a transposition table.
+"""
+
+import math
+import random
+import time
+
+X = "X"
+O = "O"
+EMPTY = None
+
+# Seconds the computer may think about a move by default
+TIME_LIMIT = 1.0
+
+# Number of positions searched between looks at the clock
+CLOCK_INTERVAL = 1024
+
+# Kinds of transposition table score
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+
+class Timeout(Exception):
+    """
+    Raised inside a search when its time budget runs out or it is stopped.
+    """
+
+
+class Game():
+    """
+    An m x n board with k in a row to win.
+
+    A Game has the same functions as the tictactoe module, so it can
+    stand in for it, e.g. in runner.py.
+    """
+
+    X = X
+    O = O
+    EMPTY = EMPTY
+
+    def __init__(self, m=3, n=3, k=3, time_limit=TIME_LIMIT):
+        if m < 1 or n < 1 or not 1 <= k <= max(m, n):
+            raise ValueError("Invalid board size")
+        self.m = m
+        self.n = n
+        self.k = k
+        self.time_limit = time_limit
+
+        # Cells are numbered n * i + j; a window is k cells in a line
+        self.windows = windows(m, n, k)
+        self.cell_windows = [[] for _ in range(m * n)]
+        for window in self.windows:
+            for cell in window:
+                self.cell_windows[cell].append(window)
+
+        # Search cells nearest the center first
+        self.order = sorted(range(m * n), key=lambda cell: (
+            abs(cell // n - (m - 1) / 2) + abs(cell % n - (n - 1) / 2)
+        ))
+
+        # Heuristic value of a window holding only one player's pieces,
+        # by piece count; a win outscores any sum of them, and faster
+        # wins score higher
+        self.scores = [0] + [10 ** count for count in range(1, k)]
+        self.win = 10 ** k * len(self.windows)
+
+        # Zobrist keys for each player in each cell
+        rng = random.Random(0)
+        self.zobrist = [[rng.getrandbits(64) for _ in range(m * n)]
+                        for _ in range(2)]
+
+        # Search results by position key:
+        # (depth, score, kind of score, best cell)
+        self.table = {}
+
+        self.nodes_searched = 0
+        self.depth_reached = 0
+        self.deadline = math.inf
+        self.stop = None
+
+    def initial_state(self):
+        """
+        Returns starting state of the board.
+        """
+        return [[EMPTY] * self.n for _ in range(self.m)]
+
+    def player(self, board):
+        """
+        Returns player who has the next turn on a board.
+        """
+        sum_x = sum(row.count(X) for row in board)
+        sum_o = sum(row.count(O) for row in board)
+        return O if sum_x > sum_o else X
+
+    def actions(self, board):
+        """
+        Returns set of all possible actions (i, j) available on the board.
+        """
+        return {(i, j) for i in range(self.m) for j in range(self.n)
+                if board[i][j] == EMPTY}
+
+    def result(self, board, action):
+        """
+        Returns the board that results from making move (i, j) on the board.
+        """
+        i, j = action
+        if not (0 <= i < self.m and 0 <= j < self.n):
+            raise ValueError("Invalid action")
+        if board[i][j] != EMPTY:
+            raise ValueError("Cell is already played")
+        new_board = [row[:] for row in board]
+        new_board[i][j] = self.player(board)
+        return new_board
+
+    def winner(self, board):
+        """
+        Returns the winner of the game, if there is one.
+        """
+        cells = self.flatten(board)
+        for window in self.windows:
+            marker = cells[window[0]]
+            if marker != EMPTY and all(cells[cell] == marker
+                                       for cell in window):
+                return marker
+        return None
+
+    def terminal(self, board):
+        """
+        Returns True if game is over, False otherwise.
+        """
+        return (self.winner(board) is not None
+                or all(EMPTY not in row for row in board))
+
+    def utility(self, board):
+        """
+        Returns 1 if X has won the game, -1 if O has won, 0 otherwise.
+        """
+        winner = self.winner(board)
+        return 1 if winner == X else -1 if winner == O else 0
+
+    def minimax(self, board, stop=None):
+        """
+        Returns the best action found for the current player within
+        `time_limit` seconds, or None if the game is over.
+        """
+        if self.terminal(board):
+            return None
+        return self.search(board, self.time_limit, stop)
+
+    def search(self, board, time_limit, stop=None):
+        """
+        Searches one ply deeper at a time until the time runs out, the
+        game is solved, the whole game tree has been searched, or the
+        `stop` event (a threading.Event) is set.
+        Returns the best action of the deepest completed search.
+        """
+        self.deadline = time.perf_counter() + time_limit
+        self.stop = stop
+        self.nodes_searched = 0
+        self.depth_reached = 0
+
+        cells = self.flatten(board)
+        turn = 0 if self.player(board) == X else 1
+        key = 0
+        for cell, marker in enumerate(cells):
+            if marker != EMPTY:
+                key ^= self.zobrist[0 if marker == X else 1][cell]
+        empty = cells.count(EMPTY)
+
+        best = None
+        for depth in range(1, empty + 1):
+            try:
+                score, best = self.root(cells, key, depth, turn, empty)
+            except Timeout:
+                break
+            self.depth_reached = depth
+            if abs(score) >= self.win:
+                break
+
+        # Out of time before the first search finished
+        if best is None:
+            best = next(cell for cell in self.order if cells[cell] == EMPTY)
+        return divmod(best, self.n)
+
+    def root(self, cells, key, depth, turn, empty):
+        """
+        Searches every move from the root to `depth` plies.
+        Returns (score for the player to move, best cell).
+        """
+        entry = self.table.get(key)
+        alpha = -math.inf
+        best = None
+        for cell in self.moves(cells, entry and entry[3]):
+            score = self.move_score(cells, key, cell, depth, alpha, math.inf,
+                                    turn, empty)
+            if score > alpha:
+                alpha = score
+                best = cell
+        self.table[key] = (depth, alpha, EXACT, best)
+        return alpha, best
+
+    def negamax(self, cells, key, depth, alpha, beta, turn, empty):
+        """
+        Returns the score of a position for the player to move, searched
+        `depth` plies deep within the (alpha, beta) window.
+        """
+        self.nodes_searched += 1
+        if self.nodes_searched % CLOCK_INTERVAL == 0 and (
+            time.perf_counter() > self.deadline
+            or self.stop is not None and self.stop.is_set()
+        ):
+            raise Timeout
+
+        # Reuse a search of this position that was at least as deep
+        entry = self.table.get(key)
+        first = None
+        if entry is not None:
+            entry_depth, score, kind, first = entry
+            if entry_depth >= depth:
+                if kind == EXACT:
+                    return score
+                elif kind == LOWER:
+                    alpha = max(alpha, score)
+                else:
+                    beta = min(beta, score)
+                if alpha >= beta:
+                    return score
+
+        if depth == 0:
+            score = self.evaluate(cells)
+            return score if turn == 0 else -score
+
+        original_alpha = alpha
+        best_score = -math.inf
+        best = None
+        for cell in self.moves(cells, first):
+            score = self.move_score(cells, key, cell, depth, alpha, beta,
+                                    turn, empty)
+            if score > best_score:
+                best_score = score
+                best = cell
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                break
+
+        if best_score <= original_alpha:
+            kind = UPPER
+        elif best_score >= beta:
+            kind = LOWER
+        else:
+            kind = EXACT
+        self.table[key] = (depth, best_score, kind, best)
+        return best_score
+
+    def move_score(self, cells, key, cell, depth, alpha, beta, turn, empty):
+        """
+        Returns the score of playing a cell for the player to move.
+        """
+        marker = X if turn == 0 else O
+        cells[cell] = marker
+        try:
+            if self.wins(cells, cell, marker):
+                return self.win + empty
+            if empty == 1:
+                return 0
+            return -self.negamax(
+                cells, key ^ self.zobrist[turn][cell], depth - 1,
+                -beta, -alpha, 1 - turn, empty - 1
+            )
+        finally:
+            cells[cell] = EMPTY
+
+    def moves(self, cells, first=None):
+        """
+        Returns the empty cells in search order, starting with `first`.
+        """
+        moves = [cell for cell in self.order
+                 if cells[cell] == EMPTY and cell != first]
+        if first is not None and cells[first] == EMPTY:
+            moves.insert(0, first)
+        return moves
+
+    def wins(self, cells, cell, marker):
+        """
+        Returns True if the piece on `cell` completes k in a row.
+        """
+        return any(all(cells[other] == marker for other in window)
+                   for window in self.cell_windows[cell])
+
+    def evaluate(self, cells):
+        """
+        Returns the heuristic value of a position for X: every window
+        that only one player can still complete counts for that player,
+        more the fuller it is.
+        """
+        score = 0
+        for window in self.windows:
+            x = o = 0
+            for cell in window:
+                if cells[cell] == X:
+                    x += 1
+                elif cells[cell] == O:
+                    o += 1
+            if o == 0:
+                score += self.scores[x]
+            elif x == 0:
+                score -= self.scores[o]
+        return score
+
+    def flatten(self, board):
+        """
+        Returns the board's cells as a list indexed by n * i + j.
+        """
+        return [marker for row in board for marker in row]
+
+
+def windows(m, n, k):
+    """
+    Returns every line of k cells on an m x n board, as tuples of cell
+    numbers.
+    """
+    windows = []
+    for i in range(m):
+        for j in range(n):
+            for di, dj in [(0, 1), (1, 0), (1, 1), (1, -1)]:
+                end_i = i + di * (k - 1)
+                end_j = j + dj * (k - 1)
+                if 0 <= end_i < m and 0 <= end_j < n:
+                    windows.append(tuple(
+                        n * (i + di * step) + j + dj * step
+                        for step in range(k)
+                    ))
+    return windows
@@ -2,7 +2,17 @@ import pygame
 import sys
 import time
 
+import mnk
 import tictactoe as ttt
+from worker import MoveSearch
+
+# Board variant: classic 3x3 Tic Tac Toe, or m x n with k in a row
+if len(sys.argv) == 4:
+    game = mnk.Game(*(int(arg) for arg in sys.argv[1:]))
+elif len(sys.argv) == 1:
+    game = ttt
+else:
+    sys.exit("Usage: python runner.py [m n k]")
 
 pygame.init()
 size = width, height = 600, 400
@@ -13,13 +23,20 @@ white = (255, 255, 255)
 
 screen = pygame.display.set_mode(size)
 
+# Shortest time the computer appears to think before moving
+AI_DELAY = 0.5
+
 mediumFont = pygame.font.Font("OpenSans-Regular.ttf", 28)
 largeFont = pygame.font.Font("OpenSans-Regular.ttf", 40)
-moveFont = pygame.font.Font("OpenSans-Regular.ttf", 60)
 
 user = None
-board = ttt.initial_state()
-ai_turn = False
+board = game.initial_state()
+rows, columns = len(board), len(board[0])
+
+# Shrink tiles to fit larger boards between the title and the button
+tile_size = min(80, (height - 140) // max(rows, columns))
+moveFont = pygame.font.Font("OpenSans-Regular.ttf", tile_size * 3 // 4)
+search = None
 
 while True:
 
@@ -67,13 +84,12 @@ while True:
     else:
 
         # Draw game board
-        tile_size = 80
-        tile_origin = (width / 2 - (1.5 * tile_size),
-                       height / 2 - (1.5 * tile_size))
+        tile_origin = (width / 2 - (columns / 2 * tile_size),
+                       height / 2 - (rows / 2 * tile_size))
         tiles = []
-        for i in range(3):
+        for i in range(rows):
             row = []
-            for j in range(3):
+            for j in range(columns):
                 rect = pygame.Rect(
                     tile_origin[0] + j * tile_size,
                     tile_origin[1] + i * tile_size,
@@ -89,12 +105,12 @@ while True:
                 row.append(rect)
             tiles.append(row)
 
-        game_over = ttt.terminal(board)
-        player = ttt.player(board)
+        game_over = game.terminal(board)
+        player = game.player(board)
 
         # Show title
         if game_over:
-            winner = ttt.winner(board)
+            winner = game.winner(board)
             if winner is None:
                 title = f"Game Over: Tie."
             else:
@@ -108,39 +124,42 @@ while True:
         titleRect.center = ((width / 2), 30)
         screen.blit(title, titleRect)
 
-        # Check for AI move
+        # Check for AI move, searching in the background so the window
+        # keeps responding
         if user != player and not game_over:
-            if ai_turn:
-                time.sleep(0.5)
-                move = ttt.minimax(board)
-                board = ttt.result(board, move)
-                ai_turn = False
-            else:
-                ai_turn = True
+            if search is None:
+                search = MoveSearch(game, board)
+            elif search.ready() and search.elapsed() >= AI_DELAY:
+                board = game.result(board, search.action)
+                search = None
 
         # Check for a user move
         click, _, _ = pygame.mouse.get_pressed()
         if click == 1 and user == player and not game_over:
             mouse = pygame.mouse.get_pos()
-            for i in range(3):
-                for j in range(3):
+            for i in range(rows):
+                for j in range(columns):
                     if (board[i][j] == ttt.EMPTY and tiles[i][j].collidepoint(mouse)):
-                        board = ttt.result(board, (i, j))
-
-        if game_over:
-            againButton = pygame.Rect(width / 3, height - 65, width / 3, 50)
-            again = mediumFont.render("Play Again", True, black)
-            againRect = again.get_rect()
-            againRect.center = againButton.center
-            pygame.draw.rect(screen, white, againButton)
-            screen.blit(again, againRect)
-            click, _, _ = pygame.mouse.get_pressed()
-            if click == 1:
-                mouse = pygame.mouse.get_pos()
-                if againButton.collidepoint(mouse):
-                    time.sleep(0.2)
-                    user = None
-                    board = ttt.initial_state()
-                    ai_turn = False
+                        board = game.result(board, (i, j))
+
+        # Offer a new game at any time, abandoning the computer's search
+        # if it is still thinking
+        againButton = pygame.Rect(width / 3, height - 65, width / 3, 50)
+        label = "Play Again" if game_over else "Restart"
+        again = mediumFont.render(label, True, black)
+        againRect = again.get_rect()
+        againRect.center = againButton.center
+        pygame.draw.rect(screen, white, againButton)
+        screen.blit(again, againRect)
+        click, _, _ = pygame.mouse.get_pressed()
+        if click == 1:
+            mouse = pygame.mouse.get_pos()
+            if againButton.collidepoint(mouse):
+                time.sleep(0.2)
+                user = None
+                board = game.initial_state()
+                if search is not None:
+                    search.cancel()
+                    search = None
 
     pygame.display.flip()
@@ -0,0 +1,119 @@
+"""
+Precomputed perfect-play table for Tic Tac Toe.
+
+Every board maps to a base-3 index (cell 3 * i + j contributes 0, 1 or 2
+for empty, X or O times 3 ** (3 * i + j)). The table holds one byte per
+index: the best move's bit index in the high four bits (NO_MOVE for
+terminal or unreachable boards) and the minimax value plus one in the
+low four bits.
+"""
+
+import os
+import sys
+
+import bitboard
+
+# Table file, written next to this module
+FILENAME = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                        "perfect_play.bin")
+
+SIZE = 3 ** 9
+NO_MOVE = 0xF
+
+# Base-3 contribution of every 9-bit mask when its cells hold a 1
+TERNARY = [sum(3 ** bit for bit in range(9) if mask >> bit & 1)
+           for mask in range(bitboard.FULL + 1)]
+
+# Loaded table, or None until first use
+table = None
+
+
+def main():
+    if len(sys.argv) != 1:
+        sys.exit("Usage: python table.py")
+    write(build())
+    print(f"Wrote {FILENAME}")
+
+
+def index(state):
+    """
+    Returns the base-3 table index of an (x, o) state.
+    """
+    x, o = state
+    return TERNARY[x] + 2 * TERNARY[o]
+
+
+def build():
+    """
+    Solves every position reachable from the empty board.
+    Returns the table as bytes.
+    """
+    entries = bytearray([NO_MOVE << 4]) * SIZE
+    seen = set()
+    frontier = [(0, 0)]
+    while frontier:
+        state = frontier.pop()
+        if state in seen:
+            continue
+        seen.add(state)
+        move = NO_MOVE
+        if not bitboard.terminal(state):
+            action = bitboard.best_action(state)
+            move = 3 * action[0] + action[1]
+            frontier.extend(bitboard.play(state, bit)
+                            for bit in bitboard.moves(state))
+        entries[index(state)] = move << 4 | bitboard.value(state) + 1
+    return bytes(entries)
+
+
+def write(entries):
+    """
+    Writes a table to FILENAME, via a temporary file.
+    """
+    temporary = f"{FILENAME}.tmp"
+    with open(temporary, "wb") as f:
+        f.write(entries)
+    os.replace(temporary, FILENAME)
+
+
+def load():
+    """
+    Returns the table, reading it from disk on first use.
+    If the file is missing or damaged, the table is rebuilt and saved.
+    """
+    global table
+    if table is None:
+        try:
+            with open(FILENAME, "rb") as f:
+                table = f.read()
+        except OSError:
+            table = b""
+        if len(table) != SIZE:
+            table = build()
+            try:
+                write(table)
+            except OSError:
+                pass
+    return table
+
+
+def best_action(state):
+    """
+    Returns the optimal action (i, j) for the current player,
+    or None if the game is over.
+    """
+    move = load()[index(state)] >> 4
+    if move == NO_MOVE:
+        return None
+    return divmod(move, 3)
+
+
+def value(state):
+    """
+    Returns the minimax value of a reachable state.
+    """
+    return (load()[index(state)] & 0xF) - 1
+
+
+if __name__ == "__main__":
+    main()
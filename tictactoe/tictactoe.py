@@ -4,10 +4,41 @@ Tic Tac Toe Player
 
 import math, copy, random
 
+import bitboard
+import table
+
 X = "X"
 O = "O"
 EMPTY = None
 
+# Cell orderings for the 8 rotations and reflections of the board,
+# each listing which (i, j) cell lands in each of the 9 positions
+SYMMETRIES = [
+    [transform(i, j) for i in range(3) for j in range(3)]
+    for transform in [
+        lambda i, j: (i, j),
+        lambda i, j: (j, 2 - i),
+        lambda i, j: (2 - i, 2 - j),
+        lambda i, j: (2 - j, i),
+        lambda i, j: (i, 2 - j),
+        lambda i, j: (j, i),
+        lambda i, j: (2 - i, j),
+        lambda i, j: (2 - j, 2 - i),
+    ]
+]
+
+# Minimax value of every position searched so far, keyed by canonical board
+transposition_table = {}
+
+# Search order for alpha-beta: center first, then corners, then edges
+MOVE_ORDER = {
+    (i, j): 0 if (i, j) == (1, 1) else 1 if i != 1 and j != 1 else 2
+    for i in range(3) for j in range(3)
+}
+
+# Number of positions visited by the most recent minimax call
+nodes_searched = 0
+
 
 def initial_state():
     """
@@ -119,14 +150,41 @@ def utility(board):
         return 0
 
 
-def minimax(board):
+def minimax(board, engine="table"):
     """
     Returns the optimal action for the current player on the board.
+
+    `engine` is "table" to look the move up in the precomputed
+    perfect-play table (searching with alpha-beta for boards that cannot
+    arise in play, which the table leaves out), "minimax" for the full
+    search with a transposition table, "alphabeta" for alpha-beta pruning
+    with move ordering, or "bitboard" for a memoized search over bitboard
+    states.
+    The number of positions visited is left in `nodes_searched`.
     """
+    global nodes_searched
+    nodes_searched = 0
+
     # check if the game is over
     if terminal(board):
         return None
 
+    if engine == "table":
+        action = table.best_action(bitboard.from_board(board))
+        if action is not None:
+            return action
+
+        # Boards that cannot arise in play are not in the table
+        return alphabeta(board)
+    elif engine == "alphabeta":
+        return alphabeta(board)
+    elif engine == "bitboard":
+        action = bitboard.best_action(bitboard.from_board(board))
+        nodes_searched = bitboard.nodes_searched
+        return action
+    elif engine != "minimax":
+        raise ValueError(f"Unknown engine {engine}")
+
     # define current player
     current_player = player(board)
 
@@ -160,23 +218,113 @@ def minimax(board):
 
 def max_score(board):
     """Helper function that returns the maximum utility value for X"""
+    global nodes_searched
+    nodes_searched += 1
+
+    key = canonical(board)
+    if key in transposition_table:
+        return transposition_table[key]
+
     if terminal(board):
-        return utility(board)
-    
-    score = -math.inf
-    for action in actions(board):
-        new_board = result(board, action)
-        score = max(score, min_score(new_board))
+        score = utility(board)
+    else:
+        score = -math.inf
+        for action in actions(board):
+            new_board = result(board, action)
+            score = max(score, min_score(new_board))
+
+    transposition_table[key] = score
     return score
 
 
 def min_score(board):
     """Helper function that returns the minimum utility value for O"""
+    global nodes_searched
+    nodes_searched += 1
+
+    key = canonical(board)
+    if key in transposition_table:
+        return transposition_table[key]
+
+    if terminal(board):
+        score = utility(board)
+    else:
+        score = math.inf
+        for action in actions(board):
+            new_board = result(board, action)
+            score = min(score, max_score(new_board))
+
+    transposition_table[key] = score
+    return score
+
+
+def alphabeta(board):
+    """
+    Returns the optimal action for the current player using alpha-beta search.
+    """
+    current_player = player(board)
+
+    # Utilities lie in [-1, 1], so finding a forced win closes the window
+    # and ends the search early
+    alpha, beta = -1, 1
+    best_action = None
+    for action in ordered_actions(board):
+        score = alphabeta_score(result(board, action), alpha, beta)
+        if current_player == X and (best_action is None or score > alpha):
+            alpha = score
+            best_action = action
+        elif current_player == O and (best_action is None or score < beta):
+            beta = score
+            best_action = action
+        if alpha >= beta:
+            break
+    return best_action
+
+
+def alphabeta_score(board, alpha, beta):
+    """
+    Helper function that returns the utility value of a board under
+    optimal play, pruning branches outside the (alpha, beta) window.
+    """
+    global nodes_searched
+    nodes_searched += 1
+
     if terminal(board):
         return utility(board)
-    
-    score = math.inf
-    for action in actions(board):
-        new_board = result(board, action)
-        score = min(score, max_score(new_board))
-    return score
\ No newline at end of file
+
+    if player(board) == X:
+        score = -math.inf
+        for action in ordered_actions(board):
+            new_board = result(board, action)
+            score = max(score, alphabeta_score(new_board, alpha, beta))
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                break
+    else:
+        score = math.inf
+        for action in ordered_actions(board):
+            new_board = result(board, action)
+            score = min(score, alphabeta_score(new_board, alpha, beta))
+            beta = min(beta, score)
+            if alpha >= beta:
+                break
+    return score
+
+
+def ordered_actions(board):
+    """
+    Returns the possible actions, most promising first.
+    """
+    return sorted(actions(board), key=lambda action: MOVE_ORDER[action])
+
+
+def canonical(board):
+    """
+    Returns a key shared by a board and all of its rotations and reflections.
+    Symmetric boards have the same minimax value, so they share one
+    transposition table entry.
+    """
+    return min(
+        "".join(board[i][j] or "." for i, j in symmetry)
+        for symmetry in SYMMETRIES
+    )
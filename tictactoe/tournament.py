@@ -0,0 +1,174 @@
+"""
+Headless self-play tournament and search benchmark for Tic Tac Toe engines.
+
+Every pair of engines plays the given number of games with each side as X,
+and every move decision is timed. Every game starts with empty search
+caches, so an engine's first decision in a game is measured cold and its
+later ones warm. Usage:
+
+    python tournament.py [games] [engine,...]
+"""
+
+import itertools
+import random
+import sys
+import time
+
+import bitboard
+import mnk
+import table
+import tictactoe as ttt
+
+# Engines accepted by tictactoe.minimax, plus an mnk.Game on a 3x3 board
+# and a player that picks a random legal move
+ENGINES = ["table", "minimax", "alphabeta", "bitboard", "mnk", "random"]
+
+# Number of games each pair plays with each side as X when none is given
+GAMES = 10
+
+
+class EngineStats():
+    """
+    Move times, nodes searched and results of one engine, with the first
+    decision of each game (searched with empty caches) kept apart as
+    "cold" from the later "warm" ones.
+    """
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.move_times = {"cold": [], "warm": []}
+        self.nodes = {"cold": 0, "warm": 0}
+        self.wins = 0
+        self.draws = 0
+        self.losses = 0
+
+    def add(self, kind, seconds, nodes):
+        self.move_times[kind].append(seconds)
+        self.nodes[kind] += nodes
+
+    def format(self):
+        """
+        Returns the statistics as human-readable lines.
+        """
+        lines = [
+            f"Engine {self.engine}: {self.wins} won, {self.draws} drawn, "
+            f"{self.losses} lost",
+        ]
+        for kind in ["cold", "warm"]:
+            times = self.move_times[kind]
+            seconds = sum(times)
+            moves = len(times)
+            nodes = self.nodes[kind]
+            lines.extend([
+                f"  {kind.capitalize()} moves: {moves}, "
+                f"{moves / seconds if seconds else 0:.0f} per second",
+                f"    Nodes: {nodes}, "
+                f"{nodes / seconds if seconds else 0:.0f} per second",
+                f"    Latency: p50 {percentile(times, 0.50) * 1000:.3f} ms, "
+                f"p90 {percentile(times, 0.90) * 1000:.3f} ms, "
+                f"p99 {percentile(times, 0.99) * 1000:.3f} ms, "
+                f"max {max(times, default=0.0) * 1000:.3f} ms",
+            ])
+        return lines
+
+
+def main():
+    if len(sys.argv) > 3:
+        sys.exit("Usage: python tournament.py [games] [engine,...]")
+    games = int(sys.argv[1]) if len(sys.argv) >= 2 else GAMES
+    engines = sys.argv[2].split(",") if len(sys.argv) == 3 else ENGINES
+    for engine in engines:
+        if engine not in ENGINES:
+            sys.exit(f"Unknown engine {engine}")
+    for line in run(engines, games):
+        print(line)
+
+
+def run(engines=ENGINES, games=GAMES, seed=0):
+    """
+    Plays `games` games between every ordered pair of distinct engines.
+    Returns report lines.
+    """
+    rng = random.Random(seed)
+
+    # Write the perfect-play table now if it is missing, so building it
+    # is not timed as part of a move
+    if "table" in engines:
+        table.load()
+
+    stats = {engine: EngineStats(engine) for engine in engines}
+    lines = []
+    for x, o in itertools.permutations(engines, 2):
+        results = {ttt.X: 0, ttt.O: 0, None: 0}
+        for _ in range(games):
+            winner = play(stats[x], stats[o], rng)
+            results[winner] += 1
+            if winner is None:
+                stats[x].draws += 1
+                stats[o].draws += 1
+            else:
+                winning, losing = (x, o) if winner == ttt.X else (o, x)
+                stats[winning].wins += 1
+                stats[losing].losses += 1
+        lines.append(f"{x} (X) vs {o} (O): {results[ttt.X]} X wins, "
+                     f"{results[ttt.O]} O wins, {results[None]} draws")
+    for engine in engines:
+        lines.extend(stats[engine].format())
+    return lines
+
+
+def play(x, o, rng):
+    """
+    Plays one game between the engines of two EngineStats, starting from
+    empty caches and timing every move into them.
+    Returns the winner, or None for a draw.
+    """
+    reset()
+    game = mnk.Game(3, 3, 3)
+    moved = set()
+    board = ttt.initial_state()
+    while not ttt.terminal(board):
+        stats = x if ttt.player(board) == ttt.X else o
+        start = time.perf_counter()
+        action, nodes = decide(stats.engine, board, game, rng)
+        seconds = time.perf_counter() - start
+        stats.add("warm" if stats in moved else "cold", seconds, nodes)
+        moved.add(stats)
+        board = ttt.result(board, action)
+    return ttt.winner(board)
+
+
+def reset():
+    """
+    Empties every engine's memoized positions, and unloads the
+    perfect-play table so it is read from disk again.
+    """
+    ttt.transposition_table.clear()
+    bitboard.values.clear()
+    table.table = None
+
+
+def decide(engine, board, game, rng):
+    """
+    Returns an engine's move on a board and the number of positions it
+    searched.
+    """
+    if engine == "random":
+        return rng.choice(sorted(ttt.actions(board))), 0
+    if engine == "mnk":
+        return game.minimax(board), game.nodes_searched
+    return ttt.minimax(board, engine), ttt.nodes_searched
+
+
+def percentile(times, fraction):
+    """
+    Returns the time below which `fraction` of the times fall.
+    """
+    if not times:
+        return 0.0
+    times = sorted(times)
+    return times[min(len(times) - 1, int(fraction * len(times)))]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Background search for the computer's move, so that runner.py can keep
+drawing the window while the computer thinks.
+"""
+
+import threading
+import time
+
+import mnk
+
+
+class MoveSearch():
+    """
+    Runs `game.minimax(board)` on a daemon thread.
+
+    The runner polls `ready()` once per frame and reads `action` when it
+    returns True. `cancel()` abandons the search; an mnk.Game search is
+    stopped early, any other search is left to finish and its result is
+    ignored.
+    """
+
+    def __init__(self, game, board):
+        self.game = game
+        self.board = board
+        self.action = None
+        self.started = time.perf_counter()
+        self.finished = threading.Event()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def run(self):
+        if isinstance(self.game, mnk.Game):
+            action = self.game.minimax(self.board, self.stopped)
+        else:
+            action = self.game.minimax(self.board)
+        if not self.stopped.is_set():
+            self.action = action
+            self.finished.set()
+
+    def ready(self):
+        """
+        Returns True once the search has found a move.
+        """
+        return self.finished.is_set()
+
+    def elapsed(self):
+        """
+        Returns the seconds since the search started.
+        """
+        return time.perf_counter() - self.started
+
+    def cancel(self):
+        """
+        Stops the search and waits for an mnk.Game search to return, so
+        the game is free for the next one.
+        """
+        self.stopped.set()
+        if isinstance(self.game, mnk.Game):
+            self.thread.join()